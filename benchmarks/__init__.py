@@ -0,0 +1,17 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : __init__.py
+Location    : ~/benchmarks
+
+Description
+---------------------------------------------------------------------
+Benchmarks of the espresso profile fitting algorithm. Run the suite
+and store a baseline with,
+
+    python -m benchmarks run --output benchmarks/baseline.json
+
+and compare a new run against the baseline with,
+
+    python -m benchmarks compare --baseline benchmarks/baseline.json
+"""
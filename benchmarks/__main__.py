@@ -0,0 +1,141 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : __main__.py
+Location    : ~/benchmarks
+
+Description
+---------------------------------------------------------------------
+Runs the benchmark suite and writes the results to a JSON baseline,
+or compares a run against a baseline and exits with a non-zero status
+when a benchmark regresses.
+"""
+
+# Import modules
+import sys
+import argparse
+import matplotlib
+
+# Render plots without a display
+matplotlib.use('Agg')
+
+import benchmarks.suite as suite  # noqa: E402
+
+
+def parse_args(
+    args
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    args                    = <list> Command-line arguments
+
+    Description
+    ---------------------------------------------------------------------
+    Parses the 'run' and 'compare' commands.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmarks the espresso profile fitting algorithm.'
+    )
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run = commands.add_parser(
+        'run',
+        help='Runs the suite and writes the results to a JSON baseline.'
+    )
+    run.add_argument('--output', default='benchmarks/baseline.json')
+
+    comparison = commands.add_parser(
+        'compare',
+        help='Compares a run, or a results file, against a baseline.'
+    )
+    comparison.add_argument('--baseline', default='benchmarks/baseline.json')
+    comparison.add_argument(
+        '--current',
+        default=None,
+        help='Results file to compare. By default the suite is run with '
+        'the parameters of the baseline.'
+    )
+    comparison.add_argument('--output', default=None)
+    comparison.add_argument('--threshold', type=float, default=0.25)
+    comparison.add_argument('--min-seconds', type=float, default=0.0005)
+
+    for command in (run, comparison):
+        command.add_argument('--lengths', type=int, nargs='+')
+        command.add_argument('--intervals', type=float, nargs='+')
+        command.add_argument('--widths', type=int, nargs='+')
+        command.add_argument('--repeat', type=int)
+
+    return parser.parse_args(args)
+
+
+def main(
+    args=None
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    args                    = <list> Optional command-line arguments,
+                                {sys.argv} by default
+
+    Description
+    ---------------------------------------------------------------------
+    Runs the command and returns the exit status, {1} when the
+    comparison finds a regression. Otherwise {0}.
+    """
+
+    args = parse_args(sys.argv[1:] if args is None else args)
+
+    # Derive the parameters of the suite, from the baseline when
+    #   comparing a new run
+    if args.command == 'compare':
+        baseline = suite.read_baseline(fileLoc=args.baseline)
+        parameters = dict(baseline['parameters'])
+    else:
+        parameters = {
+            'lengths': list(suite.LENGTHS),
+            'intervals': list(suite.INTERVALS),
+            'widths': list(suite.WIDTHS),
+            'repeat': suite.REPEAT
+        }
+    for key in parameters:
+        if getattr(args, key) is not None:
+            parameters[key] = getattr(args, key)
+
+    # Run the suite
+    if (args.command == 'compare') and (args.current is not None):
+        current = suite.read_baseline(fileLoc=args.current)
+    else:
+        current = {'results': suite.run_suite(**parameters)}
+        if args.output is not None:
+            suite.write_baseline(
+                results=current['results'],
+                fileLoc=args.output,
+                parameters=parameters
+            )
+
+    if args.command == 'run':
+        print(
+            'Benchmarks: %s, Baseline: %s' % (
+                len(current['results']),
+                args.output
+            )
+        )
+        return 0
+
+    rows = suite.compare(
+        baseline=baseline['results'],
+        current=current['results'],
+        threshold=args.threshold,
+        min_seconds=args.min_seconds
+    )
+    suite.report(rows=rows)
+
+    return int(any(row['regression'] for row in rows))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
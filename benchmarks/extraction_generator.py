@@ -0,0 +1,538 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : extraction_generator.py
+Location    : ~/benchmarks
+
+Description
+---------------------------------------------------------------------
+Generates synthetic espresso extractions with known pressure profiles,
+in the schema of the extractions written by the dashboard, for testing
+and benchmarking the espresso profile fitting algorithm.
+"""
+
+# Import modules
+import os
+import io
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+
+# Define synthetic extraction generator class
+class ExtractionGenerator():
+
+    # Columns of the extractions written by {dashboard.save_extraction}
+    COLUMNS = (
+        'User',
+        'UniqueID',
+        'Date',
+        'Time',
+        'Duration',
+        'Temperature',
+        'TUnit',
+        'Pressure',
+        'PUnit',
+        'MaxDuration',
+        'MinTemp',
+        'MaxTemp',
+        'MinPressure',
+        'MaxPressure',
+        'TempSetPoint',
+        'Profile',
+        'ProfileValues'
+    )
+
+    def __init__(
+        self,
+        TIME_INTERVAL=0.1,
+        duration_range=(15, 40),
+        infusion_rate=0.5,
+        infusion_duration_range=(2, 8),
+        infusion_pressure_range=(1, 3.5),
+        ramp_range=(0.5, 2),
+        peak_range=(7, 10),
+        rise_range=(1, 4),
+        decline_range=(0, 4),
+        noise_range=(0.02, 0.2),
+        dropout_rate=0.005,
+        set_point_range=(195, 210),
+        user='Synthetic, Ospro',
+        seed=None
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        TIME_INTERVAL           =  <float> Interval of the time series
+                                        (seconds)
+        duration_range          =  <tuple> Minimum and maximum duration
+                                        (seconds) of an extraction
+        infusion_rate           =  <float> Fraction of the extractions with
+                                        pre-infusion
+        infusion_duration_range =  <tuple> Minimum and maximum pre-infusion
+                                        duration (seconds)
+        infusion_pressure_range =  <tuple> Minimum and maximum pre-infusion
+                                        pressure (bars)
+        ramp_range              =  <tuple> Minimum and maximum duration
+                                        (seconds) of the pump ramp from 0
+                                        bars at the start of the extraction
+        peak_range              =  <tuple> Minimum and maximum peak
+                                        extraction pressure (bars)
+        rise_range              =  <tuple> Minimum and maximum rise (bars)
+                                        from {p0} to the peak extraction
+                                        pressure
+        decline_range           =  <tuple> Minimum and maximum decline
+                                        (bars) from the peak extraction
+                                        pressure to the end of the
+                                        extraction
+        noise_range             =  <tuple> Minimum and maximum standard
+                                        deviation (bars) of the pressure
+                                        sensor noise of an extraction
+        dropout_rate            =  <float> Probability that a sample is
+                                        dropped
+        set_point_range         =  <tuple> Minimum and maximum temperature
+                                        set point (Fahrenheit)
+        user                    =  <str> Value of the User column
+        seed                    =  <int> Optional seed of the random number
+                                        generator
+
+        Description
+        ---------------------------------------------------------------------
+        Creates an instance of the ExtractionGenerator class. Each
+        extraction follows a pressure profile of the espresso profile
+        fitting algorithm, an optional pre-infusion hold followed by the
+        pressures {p0}, {p1}, {p2}, {p3}, {p4} at the quartiles of the
+        extraction, with a rise to a peak at {p1} and a decline to {p4}.
+        The pressure ramps from 0 bars at the start of the extraction to
+        the profile, as the pump builds pressure, so that the first
+        samples are not described by the profile. Sensor noise, rounding
+        to the sensor resolution and dropped samples are added to each
+        extraction. The extractions are generated as
+        matrices, so that each batch is generated without a loop over the
+        extractions.
+        """
+
+        # Assign class variables
+        self.TIME_INTERVAL = TIME_INTERVAL
+        self.TIME_INTERVAL_CONVERSION = int(
+            np.round(1 / TIME_INTERVAL, decimals=0)
+        )
+        self.duration_range = duration_range
+        self.infusion_rate = infusion_rate
+        self.infusion_duration_range = infusion_duration_range
+        self.infusion_pressure_range = infusion_pressure_range
+        self.ramp_range = ramp_range
+        self.peak_range = peak_range
+        self.rise_range = rise_range
+        self.decline_range = decline_range
+        self.noise_range = noise_range
+        self.dropout_rate = dropout_rate
+        self.set_point_range = set_point_range
+        self.user = user
+        self.rng = np.random.default_rng(seed)
+
+    def generate(
+        self,
+        n,
+        uniqueID=1
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        n                       = <int> Number of extractions
+        uniqueID                = <int> UniqueID of the first extraction
+
+        Description
+        ---------------------------------------------------------------------
+        Returns a batch of {n} extractions as a dictionary object of
+        matrices of shape (extractions, samples), padded beyond the length
+        of each extraction, and of their ground truth,
+
+            uniqueID      = UniqueID of each extraction
+            lengths       = Number of samples of each extraction
+            x             = Time series
+            y             = Pressure series
+            temperature   = Temperature series
+            keep          = Mask of the samples that are not dropped
+            setPoint      = Temperature set point of each extraction
+            parameters    = Espresso extraction parameters, {inf. dur},
+                            {inf. pres}, {p0}, {p1}, {p2}, {p3}, {p4}, with
+                            an {inf. dur} of {0} without pre-infusion
+            knots         = Times (seconds) of {p0}, {p1}, {p2}, {p3}, {p4}
+            ramp          = Duration (seconds) of the pump ramp from 0 bars
+            noise         = Standard deviation (bars) of the sensor noise
+        """
+
+        rng = self.rng
+        conversion = self.TIME_INTERVAL_CONVERSION
+
+        # Draw the duration of each extraction
+        lengths = rng.integers(
+            self.duration_range[0] * conversion,
+            self.duration_range[1] * conversion + 1,
+            size=n
+        ) + 1
+        x = np.round(
+            np.arange(np.max(lengths)) * self.TIME_INTERVAL,
+            decimals=6
+        )
+
+        # Draw the pre-infusion
+        infusion = rng.random(n) < self.infusion_rate
+        infusionDuration = np.where(
+            infusion,
+            np.round(rng.uniform(*self.infusion_duration_range, size=n), 1),
+            0
+        )
+        infusionPressure = np.round(
+            rng.uniform(*self.infusion_pressure_range, size=n),
+            decimals=1
+        )
+
+        # Draw the extraction pressures, a rise to the peak at {p1}
+        #   followed by a decline to {p4}
+        peak = rng.uniform(*self.peak_range, size=n)
+        decline = rng.uniform(*self.decline_range, size=n)
+        fractions = np.sort(rng.random((n, 3)), axis=1)
+        pressures = np.round(
+            np.column_stack((
+                peak - rng.uniform(*self.rise_range, size=n),
+                peak,
+                peak[:, np.newaxis] - decline[:, np.newaxis] * fractions
+            )),
+            decimals=1
+        )
+        parameters = np.column_stack((
+            infusionDuration,
+            np.where(infusion, infusionPressure, 0),
+            pressures
+        ))
+
+        # Derive the knot times at the quartiles after pre-infusion, as
+        #   {EPFA.calculate_quartiles}
+        x0 = np.where(infusion, np.round(infusionDuration + 1), 0)
+        span = (lengths - 1) * self.TIME_INTERVAL - x0
+        knots = np.round(
+            x0[:, np.newaxis] +
+            span[:, np.newaxis] * np.array([0, 0.25, 0.5, 0.75, 1]),
+            decimals=6
+        )
+
+        # Render the pressure profiles by linear interpolation between
+        #   the knots, holding the pre-infusion pressure from the start
+        xp = np.column_stack((np.zeros(n), infusionDuration, knots))
+        fp = np.column_stack((
+            np.where(infusion, infusionPressure, pressures[:, 0]),
+            np.where(infusion, infusionPressure, pressures[:, 0]),
+            pressures
+        ))
+        y = self.interpolate(x=x, xp=xp, fp=fp)
+
+        # Ramp the pressure from 0 bars at the start of the extraction
+        ramp = np.round(rng.uniform(*self.ramp_range, size=n), decimals=1)
+        y = y * np.clip(x[np.newaxis, :] / ramp[:, np.newaxis], 0, 1)
+
+        # Add the sensor noise at the sensor resolution
+        noise = rng.uniform(*self.noise_range, size=n)
+        y = np.round(
+            np.maximum(
+                y + rng.standard_normal(y.shape) * noise[:, np.newaxis],
+                0
+            ),
+            decimals=1
+        )
+
+        # Drop samples, except the first and the last
+        valid = np.arange(x.shape[0]) < lengths[:, np.newaxis]
+        keep = valid & (rng.random(y.shape) >= self.dropout_rate)
+        keep[:, 0] = True
+        keep[np.arange(n), lengths - 1] = True
+
+        # Draw the temperature series
+        setPoint = rng.integers(
+            self.set_point_range[0],
+            self.set_point_range[1] + 1,
+            size=n
+        )
+        temperature = np.round(
+            setPoint[:, np.newaxis] - 1 + rng.standard_normal(y.shape)
+        ).astype(int)
+
+        return {
+            'uniqueID': np.arange(uniqueID, uniqueID + n),
+            'lengths': lengths,
+            'x': np.broadcast_to(x, y.shape),
+            'y': y,
+            'temperature': temperature,
+            'keep': keep,
+            'setPoint': setPoint,
+            'parameters': parameters,
+            'knots': knots,
+            'ramp': ramp,
+            'noise': noise
+        }
+
+    def interpolate(
+        self,
+        x,
+        xp,
+        fp
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        xp                      = <np.array()> Matrix of the knot times of
+                                    each extraction, in increasing order
+        fp                      = <np.array()> Matrix of the knot values of
+                                    each extraction
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the linear interpolation of {x} on the knots of each
+        extraction as a matrix of shape (extractions, samples). Time values
+        beyond the last knot take the value of the last knot, and knots of
+        zero width are skipped.
+        """
+
+        # Locate the knot interval of each time value
+        k = np.clip(
+            np.sum(
+                x[np.newaxis, :, np.newaxis] >= xp[:, np.newaxis, :],
+                axis=2
+            ) - 1,
+            0,
+            xp.shape[1] - 2
+        )
+        xa = np.take_along_axis(xp, k, axis=1)
+        xb = np.take_along_axis(xp, k + 1, axis=1)
+        fa = np.take_along_axis(fp, k, axis=1)
+        fb = np.take_along_axis(fp, k + 1, axis=1)
+
+        # Weight the right knot of each interval
+        width = xb - xa
+        w = np.clip(
+            np.divide(
+                x - xa,
+                width,
+                out=np.zeros(width.shape),
+                where=width > 0
+            ),
+            0,
+            1
+        )
+
+        return fa + w * (fb - fa)
+
+    def to_frame(
+        self,
+        shots,
+        start=None,
+        interval=900
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        shots                   = <dict> Batch of extractions returned by
+                                    {generate}
+        start                   = <dt.datetime> Optional date and time of
+                                    the first extraction, the current date
+                                    and time by default
+        interval                = <int> Interval (seconds) between the
+                                    extractions
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the samples of every extraction that are not dropped as a
+        dataframe with the columns of {dashboard.save_extraction}, in the
+        order of the extractions.
+        """
+
+        keep = shots['keep']
+        counts = np.sum(keep, axis=1)
+        rows, cols = np.nonzero(keep)
+
+        # Format the date and time of each extraction
+        if start is None:
+            start = dt.datetime.now().replace(microsecond=0)
+        stamps = pd.Series(
+            pd.Timestamp(start) +
+            pd.to_timedelta(
+                np.arange(keep.shape[0]) * interval,
+                unit='s'
+            )
+        )
+        date = stamps.dt.strftime('%d/%b/%Y').str.upper().to_numpy()
+        time = stamps.dt.strftime('%H:%M:%S').to_numpy()
+
+        # Summarize each extraction over its samples
+        temperature = shots['temperature']
+        y = shots['y']
+        duration = (shots['lengths'] - 1) * self.TIME_INTERVAL
+
+        return pd.DataFrame(
+            data={
+                'User': self.user,
+                'UniqueID': np.repeat(shots['uniqueID'], counts),
+                'Date': np.repeat(date, counts),
+                'Time': np.repeat(time, counts),
+                'Duration': shots['x'][rows, cols],
+                'Temperature': temperature[rows, cols],
+                'TUnit': 'F',
+                'Pressure': y[rows, cols],
+                'PUnit': 'Bars',
+                'MaxDuration': np.repeat(np.round(duration, 1), counts),
+                'MinTemp': np.repeat(
+                    np.min(np.where(keep, temperature, np.iinfo(int).max), 1),
+                    counts
+                ),
+                'MaxTemp': np.repeat(
+                    np.max(np.where(keep, temperature, np.iinfo(int).min), 1),
+                    counts
+                ),
+                'MinPressure': np.repeat(
+                    np.min(np.where(keep, y, np.inf), axis=1),
+                    counts
+                ),
+                'MaxPressure': np.repeat(
+                    np.max(np.where(keep, y, -np.inf), axis=1),
+                    counts
+                ),
+                'TempSetPoint': np.repeat(shots['setPoint'], counts),
+                'Profile': 'Manual',
+                'ProfileValues': 0
+            },
+            columns=list(self.COLUMNS)
+        )
+
+    def ground_truth(
+        self,
+        shots
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        shots                   = <dict> Batch of extractions returned by
+                                    {generate}
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the ground truth of each extraction as a dataframe, keyed
+        by UniqueID.
+        """
+
+        parameters = shots['parameters']
+        knots = shots['knots']
+
+        return pd.DataFrame(
+            data={
+                'UniqueID': shots['uniqueID'],
+                'MaxDuration': np.round(
+                    (shots['lengths'] - 1) * self.TIME_INTERVAL,
+                    decimals=1
+                ),
+                'Samples': np.sum(shots['keep'], axis=1),
+                'Dropped': shots['lengths'] - np.sum(shots['keep'], axis=1),
+                'Noise': np.round(shots['noise'], decimals=6),
+                'Ramp': shots['ramp'],
+                'InfusionDuration': parameters[:, 0],
+                'InfusionPressure': parameters[:, 1],
+                'P0': parameters[:, 2],
+                'P1': parameters[:, 3],
+                'P2': parameters[:, 4],
+                'P3': parameters[:, 5],
+                'P4': parameters[:, 6],
+                'T0': knots[:, 0],
+                'T1': knots[:, 1],
+                'T2': knots[:, 2],
+                'T3': knots[:, 3],
+                'T4': knots[:, 4]
+            }
+        )
+
+    def write(
+        self,
+        n,
+        dirName,
+        uniqueID=1,
+        chunkSize=4096,
+        start=None,
+        interval=900
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        n                       = <int> Number of extractions
+        dirName                 = <str> Path to the output directory
+        uniqueID                = <int> UniqueID of the first extraction
+        chunkSize               = <int> Number of extractions generated per
+                                    batch
+        start                   = <dt.datetime> Optional date and time of
+                                    the first extraction, the current date
+                                    and time by default
+        interval                = <int> Interval (seconds) between the
+                                    extractions
+
+        Description
+        ---------------------------------------------------------------------
+        Generates {n} extractions in batches of {chunkSize} and writes
+        each extraction to {dirName} as
+        Diagnostics_{UniqueID}_{Date}.csv, as {dashboard.save_extraction},
+        and the ground truth of every extraction to ground_truth.csv.
+        Each batch is formatted by a single call to {pd.DataFrame.to_csv}
+        and split into the files of its extractions.
+        """
+
+        if start is None:
+            start = dt.datetime.now().replace(microsecond=0)
+
+        truthLoc = os.path.join(dirName, 'ground_truth.csv')
+        if os.path.isfile(truthLoc):
+            os.remove(truthLoc)
+
+        for offset in range(0, n, chunkSize):
+            shots = self.generate(
+                n=min(chunkSize, n - offset),
+                uniqueID=uniqueID + offset
+            )
+            df = self.to_frame(
+                shots=shots,
+                start=start + dt.timedelta(seconds=offset * interval),
+                interval=interval
+            )
+
+            # Format the batch and split it into the extractions
+            buffer = io.StringIO()
+            df.to_csv(buffer, sep=',', index=False)
+            lines = buffer.getvalue().splitlines(keepends=True)
+            header = lines[0]
+            bounds = np.concatenate(
+                ([1], 1 + np.cumsum(np.sum(shots['keep'], axis=1)))
+            )
+            for i, ID in enumerate(shots['uniqueID']):
+                date = df['Date'].iat[bounds[i] - 1]
+                with open(
+                    os.path.join(
+                        dirName,
+                        '.'.join([
+                            '_'.join([
+                                'Diagnostics',
+                                str(ID),
+                                date.replace('/', '')
+                            ]),
+                            'csv'
+                        ])
+                    ),
+                    'w'
+                ) as f:
+                    f.write(header)
+                    f.writelines(lines[bounds[i]:bounds[i + 1]])
+
+            # Append the ground truth
+            self.ground_truth(shots=shots).to_csv(
+                truthLoc,
+                sep=',',
+                index=False,
+                mode='a',
+                header=(offset == 0)
+            )
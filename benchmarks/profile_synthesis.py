@@ -0,0 +1,109 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : profile_synthesis.py
+Location    : ~/benchmarks
+
+Description
+---------------------------------------------------------------------
+Compares the run-time of simulating the possible espresso extraction
+profiles with {EPFA.interpolate} applied to each row against the
+batched {EPFA.render_profiles}. Run from the root of the repository
+with,
+
+    python -m benchmarks.profile_synthesis
+"""
+
+# Import modules
+import os
+import time
+import numpy as np
+import pandas as pd
+from ospro.algorithms.espresso_profile_fitting_algorithm import EPFA as EPFA
+
+# Run benchmark
+if __name__ == '__main__':
+
+    # Initialize global variables
+    fileLoc = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        'diagnostics',
+        'Example.csv'
+    )
+    repeat = 5
+
+    # Import extraction data series
+    df = pd.read_csv(
+        fileLoc,
+        sep=','
+    )
+    x = df['Duration'].to_numpy()
+    y = df['Pressure'].to_numpy()
+
+    # Simulate the possible espresso extraction parameters
+    epfa = EPFA()
+    xti, ypi, yp0, yp1, yp2, yp3, yp4, ysmoothed = epfa.reduce(x=x, y=y)
+    sprofiles = epfa.simulate_parameters(
+        xti=xti,
+        ypi=ypi,
+        yp0=yp0,
+        yp1=yp1,
+        yp2=yp2,
+        yp3=yp3,
+        yp4=yp4
+    )
+
+    # Time each method of simulating the pressure profiles
+    runTimes = {}
+    for method, func in [
+        (
+            'apply_along_axis',
+            lambda: np.apply_along_axis(
+                func1d=epfa.interpolate,
+                axis=1,
+                arr=sprofiles,
+                x=x
+            )
+        ),
+        (
+            'render_profiles',
+            lambda: epfa.render_profiles(
+                a=sprofiles,
+                x=x
+            )
+        )
+    ]:
+        times = []
+        for i in range(repeat):
+            t1 = time.perf_counter()
+            maty0 = func()
+            t2 = time.perf_counter()
+            times.append(t2 - t1)
+        runTimes[method] = (min(times), maty0)
+
+    # Log
+    print(
+        'Simulations: %s, Time values: %s, Repeat: %s' % (
+            sprofiles.shape[0],
+            x.shape[0],
+            repeat
+        )
+    )
+    for method, (runTime, maty0) in runTimes.items():
+        print(
+            "{:<{len0}} {:<{len1}}".format(
+                'Method: %s' % (method),
+                'Best run-time: %.6f seconds' % (runTime),
+                len0=33,
+                len1=40
+            )
+        )
+    print(
+        'Speedup: %.1fx, Identical profiles: %s' % (
+            runTimes['apply_along_axis'][0] / runTimes['render_profiles'][0],
+            np.array_equal(
+                runTimes['apply_along_axis'][1],
+                runTimes['render_profiles'][1]
+            )
+        )
+    )
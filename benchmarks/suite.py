@@ -0,0 +1,477 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : suite.py
+Location    : ~/benchmarks
+
+Description
+---------------------------------------------------------------------
+Times the stages of the espresso profile fitting algorithm and tracks
+their peak memory across extraction durations, sampling intervals and
+candidate grid widths, stores the results as a JSON baseline and
+reports the regressions of a run against a baseline.
+"""
+
+# Import modules
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+import datetime as dt
+import numpy as np
+from ospro.algorithms.espresso_profile_fitting_algorithm import EPFA as EPFA
+from benchmarks.extraction_generator import (
+    ExtractionGenerator as ExtractionGenerator
+)
+
+# Default benchmark parameters
+LENGTHS = (10, 20, 30, 45, 60)
+INTERVALS = (0.1, 0.05)
+WIDTHS = (2, 3)
+REPEAT = 5
+
+
+# Define benchmark functions
+def time_stage(
+    func,
+    repeat
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    func                    = <callable> Stage to benchmark
+    repeat                  = <int> Number of timed runs
+
+    Description
+    ---------------------------------------------------------------------
+    Returns the best run-time (seconds) of {repeat} runs of {func}, and
+    the peak memory (bytes) allocated by a separate run traced by
+    {tracemalloc}, so that the tracing overhead is not timed.
+    """
+
+    times = []
+    for i in range(repeat):
+        t1 = time.perf_counter()
+        func()
+        t2 = time.perf_counter()
+        times.append(t2 - t1)
+
+    tracemalloc.start()
+    try:
+        func()
+        peakBytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peakBytes
+
+
+def benchmark_key(
+    stage,
+    case
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    stage                   = <str> Name of the benchmarked stage
+    case                    = <dict> Parameters of the benchmarked case
+
+    Description
+    ---------------------------------------------------------------------
+    Returns the key of a benchmark in the results, e.g.
+    'reduce/length=30/interval=0.1'.
+    """
+
+    return '/'.join(
+        [stage] + ['%s=%s' % (key, value) for key, value in case.items()]
+    )
+
+
+def generate_extraction(
+    length,
+    interval
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    length                  = <int> Duration (seconds) of the extraction
+    interval                = <float> Sampling interval (seconds)
+
+    Description
+    ---------------------------------------------------------------------
+    Returns the Time series, the Pressure series and the espresso
+    extraction parameters of a synthetic extraction with pre-infusion.
+    The extraction is seeded, so that every run benchmarks the same
+    series.
+    """
+
+    shots = ExtractionGenerator(
+        TIME_INTERVAL=interval,
+        duration_range=(length, length),
+        infusion_rate=1,
+        dropout_rate=0,
+        seed=0
+    ).generate(n=1)
+    n = shots['lengths'][0]
+
+    return shots['x'][0, :n], shots['y'][0, :n], shots['parameters'][0]
+
+
+def grid_axes(
+    parameters,
+    width
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    parameters              = <np.array()> Espresso extraction parameters,
+                                {inf. dur}, {inf. pres}, {p0}, {p1}, {p2},
+                                {p3}, {p4}
+    width                   = <int> Number of values of each axis
+
+    Description
+    ---------------------------------------------------------------------
+    Returns the axes of a candidate space of {width} integer values
+    around each espresso extraction parameter, as {EPFA.reduce_range}.
+    """
+
+    return [
+        np.arange(lower, lower + width)
+        for lower in np.maximum(
+            np.floor(parameters) - (width - 1) // 2,
+            1
+        )
+    ]
+
+
+def run_suite(
+    lengths=LENGTHS,
+    intervals=INTERVALS,
+    widths=WIDTHS,
+    repeat=REPEAT
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    lengths                 = <tuple> Durations (seconds) of the
+                                extractions
+    intervals               = <tuple> Sampling intervals (seconds) of the
+                                extractions
+    widths                  = <tuple> Number of values of each axis of the
+                                candidate spaces
+    repeat                  = <int> Number of timed runs of each stage
+
+    Description
+    ---------------------------------------------------------------------
+    Benchmarks each stage of the espresso profile fitting algorithm,
+
+        reduce              = {EPFA.reduce}
+        simulate_profiles   = {EPFA.simulate_profiles} of a candidate
+                              space of each width
+        fit_profile         = {EPFA.fit_profile} of the simulated profiles
+        solve               = {EPFA.solve}
+        plot_solution       = {EPFA.plot_solution}
+
+    for an extraction of each duration and sampling interval, and returns
+    the results as a dictionary object keyed by stage and case.
+    """
+
+    results = {}
+
+    # Time a stage and record its result
+    def record(
+        stage,
+        case,
+        func
+    ):
+        results[benchmark_key(stage=stage, case=case)] = dict(
+            zip(
+                ('stage', 'case', 'seconds', 'peakBytes'),
+                (stage, case) + time_stage(func=func, repeat=repeat)
+            )
+        )
+
+    with tempfile.TemporaryDirectory() as dirName:
+        for length in lengths:
+            for interval in intervals:
+                x, y, parameters = generate_extraction(
+                    length=length,
+                    interval=interval
+                )
+                epfa = EPFA(TIME_INTERVAL=interval)
+                case = {'length': length, 'interval': interval}
+
+                record(
+                    stage='reduce',
+                    case=case,
+                    func=lambda: epfa.reduce(x=x, y=y)
+                )
+
+                # Simulate and fit candidate spaces of each width
+                for width in widths:
+                    xti, ypi, yp0, yp1, yp2, yp3, yp4 = grid_axes(
+                        parameters=parameters,
+                        width=width
+                    )
+                    maty0, profiles = epfa.simulate_profiles(
+                        x=x,
+                        xti=xti,
+                        ypi=ypi,
+                        yp0=yp0,
+                        yp1=yp1,
+                        yp2=yp2,
+                        yp3=yp3,
+                        yp4=yp4
+                    )
+                    widthCase = dict(case, width=width)
+                    record(
+                        stage='simulate_profiles',
+                        case=widthCase,
+                        func=lambda: epfa.simulate_profiles(
+                            x=x,
+                            xti=xti,
+                            ypi=ypi,
+                            yp0=yp0,
+                            yp1=yp1,
+                            yp2=yp2,
+                            yp3=yp3,
+                            yp4=yp4
+                        )
+                    )
+                    record(
+                        stage='fit_profile',
+                        case=widthCase,
+                        func=lambda: epfa.fit_profile(maty0=maty0, y=y)
+                    )
+                    del maty0
+
+                record(
+                    stage='solve',
+                    case=case,
+                    func=lambda: epfa.solve(x=x, y=y)
+                )
+
+                solution = epfa.solve(x=x, y=y)
+                solution['ppfa']['runTime'] = '0:00:00 hh:mm:ss'
+                record(
+                    stage='plot_solution',
+                    case=case,
+                    func=lambda: epfa.plot_solution(
+                        solution=solution,
+                        dirName=dirName,
+                        fileName='benchmark'
+                    )
+                )
+
+    return results
+
+
+def write_baseline(
+    results,
+    fileLoc,
+    parameters
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    results                 = <dict> Results returned by {run_suite}
+    fileLoc                 = <str> Path to the JSON baseline
+    parameters              = <dict> Parameters of {run_suite}
+
+    Description
+    ---------------------------------------------------------------------
+    Writes the results with the parameters of the suite and the
+    environment to {fileLoc}.
+    """
+
+    dirName = os.path.dirname(fileLoc)
+    if dirName:
+        os.makedirs(dirName, exist_ok=True)
+
+    with open(fileLoc, 'w') as f:
+        json.dump(
+            {
+                'created': dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'version': EPFA.VERSION,
+                'python': sys.version.split()[0],
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'parameters': parameters,
+                'results': results
+            },
+            f,
+            indent=4
+        )
+
+
+def read_baseline(
+    fileLoc
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    fileLoc                 = <str> Path to the JSON baseline
+
+    Description
+    ---------------------------------------------------------------------
+    Reads {fileLoc} and returns a dictionary object.
+    """
+
+    if not os.path.isfile(fileLoc):
+        raise FileNotFoundError(
+            'ERROR: Baseline {%s} does not exist.' % (fileLoc)
+        )
+
+    with open(fileLoc, 'r') as f:
+        return json.load(f)
+
+
+def compare(
+    baseline,
+    current,
+    threshold=0.25,
+    min_seconds=0.0005
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    baseline                = <dict> Results of the baseline
+    current                 = <dict> Results of the current run
+    threshold               = <float> Relative increase of the run-time
+                                or of the peak memory above which a
+                                result is a regression
+    min_seconds             = <float> Increase of the run-time (seconds)
+                                below which a result is not a regression,
+                                so that the timer noise of the fastest
+                                stages is not reported
+
+    Description
+    ---------------------------------------------------------------------
+    Returns a row for each benchmark of both {baseline} and {current}
+    with the ratios of the current to the baseline run-time and peak
+    memory, and whether either ratio exceeds 1 + {threshold}, followed by
+    a row for each benchmark removed from or added to {current}, with
+    the status 'removed' or 'added' and without ratios.
+    """
+
+    rows = []
+    for key in baseline:
+        if key not in current:
+            rows.append({
+                'key': key,
+                'status': 'removed',
+                'seconds': (baseline[key]['seconds'], None),
+                'peakBytes': (baseline[key]['peakBytes'], None),
+                'timeRatio': None,
+                'memoryRatio': None,
+                'regression': False
+            })
+            continue
+        timeRatio = (
+            current[key]['seconds'] /
+            max(baseline[key]['seconds'], 1e-9)
+        )
+        memoryRatio = (
+            current[key]['peakBytes'] /
+            max(baseline[key]['peakBytes'], 1)
+        )
+        rows.append({
+            'key': key,
+            'status': 'compared',
+            'seconds': (baseline[key]['seconds'], current[key]['seconds']),
+            'peakBytes': (
+                baseline[key]['peakBytes'],
+                current[key]['peakBytes']
+            ),
+            'timeRatio': timeRatio,
+            'memoryRatio': memoryRatio,
+            'regression': bool(
+                (
+                    (timeRatio > 1 + threshold) and
+                    (
+                        current[key]['seconds'] - baseline[key]['seconds'] >
+                        min_seconds
+                    )
+                ) or
+                (memoryRatio > 1 + threshold)
+            )
+        })
+
+    for key in current:
+        if key not in baseline:
+            rows.append({
+                'key': key,
+                'status': 'added',
+                'seconds': (None, current[key]['seconds']),
+                'peakBytes': (None, current[key]['peakBytes']),
+                'timeRatio': None,
+                'memoryRatio': None,
+                'regression': False
+            })
+
+    return rows
+
+
+def report(
+    rows
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    rows                    = <list> Rows returned by {compare}
+
+    Description
+    ---------------------------------------------------------------------
+    Prints a line for each row of {rows}, followed by the number of
+    regressions and of the benchmarks removed from and added to the
+    current run.
+    """
+
+    # Format a value of a row, or '-' when the benchmark is missing
+    def fmt(
+        template,
+        value
+    ):
+        return '-' if value is None else template % (value)
+
+    print(
+        "{:<{len0}} {:>{len1}} {:>{len1}} {:>{len2}} {:>{len2}}".format(
+            'Benchmark',
+            'Baseline (s)',
+            'Current (s)',
+            'Time',
+            'Memory',
+            len0=48,
+            len1=13,
+            len2=7
+        )
+    )
+    for row in rows:
+        print(
+            "{:<{len0}} {:>{len1}} {:>{len1}} {:>{len2}} {:>{len2}} {}".format(
+                row['key'],
+                fmt('%.6f', row['seconds'][0]),
+                fmt('%.6f', row['seconds'][1]),
+                fmt('%.2fx', row['timeRatio']),
+                fmt('%.2fx', row['memoryRatio']),
+                (
+                    'REGRESSION' if row['regression'] else
+                    '' if row['status'] == 'compared' else
+                    row['status'].upper()
+                ),
+                len0=48,
+                len1=13,
+                len2=7
+            )
+        )
+    print(
+        'Benchmarks: %s, Regressions: %s, Removed: %s, Added: %s' % (
+            sum(row['status'] == 'compared' for row in rows),
+            sum(row['regression'] for row in rows),
+            sum(row['status'] == 'removed' for row in rows),
+            sum(row['status'] == 'added' for row in rows)
+        )
+    )
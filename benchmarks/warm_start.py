@@ -0,0 +1,139 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : warm_start.py
+Location    : ~/benchmarks
+
+Description
+---------------------------------------------------------------------
+Checks the warm-start search of {EPFA.solve} from a prior profile
+against the 'dp' solver, which returns the best profile of the same
+candidate space, over synthetic extractions. Each warm-start solution
+must be a local minimum of the candidate lattice, and should match the
+'dp' solution. Run from the root of the repository with,
+
+    python -m benchmarks.warm_start
+
+Exits with a non-zero status when a solution is not a local minimum.
+"""
+
+# Import modules
+import sys
+import itertools
+import numpy as np
+from ospro.algorithms.espresso_profile_fitting_algorithm import EPFA as EPFA
+from ospro.algorithms.espresso_profile_fitting_algorithm import (
+    CandidateSpace as CandidateSpace
+)
+from benchmarks.extraction_generator import (
+    ExtractionGenerator as ExtractionGenerator
+)
+
+
+def is_local_minimum(
+    epfa,
+    x,
+    y,
+    solution
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    epfa                    = <EPFA> Instance of the espresso profile
+                                fitting algorithm
+    x                       = <np.array()> Vector of the Time series
+    y                       = <np.array()> Vector of the Pressure series
+    solution                = <dict> Solution returned by {EPFA.solve}
+
+    Description
+    ---------------------------------------------------------------------
+    Returns whether no profile within one possible value of the solution
+    on every pressure axis, and of any possible pre-infusion duration,
+    has a smaller error than the solution. The series are resampled as
+    by {EPFA.solve}.
+    """
+
+    x, y = epfa.resample_series(x=x, y=y)
+    xti, ypi, yp0, yp1, yp2, yp3, yp4, ysmoothed = epfa.reduce(x=x, y=y)
+    space = CandidateSpace(
+        xti=xti,
+        ypi=ypi,
+        yp0=yp0,
+        yp1=yp1,
+        yp2=yp2,
+        yp3=yp3,
+        yp4=yp4
+    )
+    radices = np.array(space.radices, dtype=np.int64)
+    digits = space.digits(
+        index=np.array([solution['ppfa']['id']])
+    )[0, space.columns].astype(np.int64)
+    free = np.zeros(len(space.axes), dtype=bool)
+    if space.ncols > 5:
+        free[list(space.columns).index(0)] = True
+
+    # Score every profile of the neighbourhood
+    window = space.window(
+        lower=np.where(free, 0, np.maximum(digits - 1, 0)),
+        upper=np.where(free, radices - 1, np.minimum(digits + 1, radices - 1))
+    )
+    sse = epfa.score_profiles(
+        x=x,
+        y=y,
+        a=window.decode(index=np.arange(window.size))
+    )
+
+    return bool(np.min(sse) >= solution['ppfa']['sse'] - 1e-6)
+
+
+# Run check
+if __name__ == '__main__':
+
+    # Initialize global variables
+    n = 40
+    offsets = (0, 1, 2)
+
+    # Generate the extractions
+    shots = ExtractionGenerator(seed=1).generate(n=n)
+
+    # Solve each extraction from each prior profile
+    failures = 0
+    mismatches = 0
+    for offset, i in itertools.product(offsets, range(n)):
+        length = shots['lengths'][i]
+        keep = shots['keep'][i, :length]
+        x = shots['x'][i, :length][keep]
+        y = shots['y'][i, :length][keep]
+        parameters = shots['parameters'][i]
+        if parameters[0] > 0:
+            prior = parameters + offset
+        else:
+            prior = parameters[2:] + offset
+
+        epfa = EPFA()
+        warm = epfa.solve(x=x, y=y, prior=prior)
+        dp = EPFA(solver='dp').solve(x=x, y=y)
+
+        minimum = is_local_minimum(epfa=epfa, x=x, y=y, solution=warm)
+        failures += int(not minimum)
+        mismatches += int(warm['ppfa']['sse'] > dp['ppfa']['sse'] + 1e-6)
+        if not minimum:
+            print(
+                'Offset: %s, Shot: %s, Warm SSE: %.6f, DP SSE: %.6f, '
+                'not a local minimum' % (
+                    offset,
+                    i,
+                    warm['ppfa']['sse'],
+                    dp['ppfa']['sse']
+                )
+            )
+
+    # Log
+    print(
+        'Extractions: %s, Worse than dp: %s, Not a local minimum: %s' % (
+            n * len(offsets),
+            mismatches,
+            failures
+        )
+    )
+    sys.exit(int(failures > 0))
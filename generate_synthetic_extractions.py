@@ -0,0 +1,62 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : generate_synthetic_extractions.py
+Location    : ~/
+
+Description
+---------------------------------------------------------------------
+Generates synthetic espresso extractions and their ground truth in the
+schema of the ~/diagnostics/ extractions.
+"""
+
+# Import modules
+import os
+import time
+import datetime as dt
+import ospro.utils.utils as utils
+from benchmarks.extraction_generator import (
+    ExtractionGenerator as ExtractionGenerator
+)
+
+# Generate extractions
+if __name__ == '__main__':
+
+    # Initialize global variables
+    config = {
+        'outputs': {
+            'path': os.path.join(
+                os.path.dirname(__file__),
+                'synthetic'
+            ),
+            'root': dt.datetime.now().strftime("%Y-%m-%d %I-%M-%S%p"),
+            'subFolders': ['extractions']
+        }
+    }
+    n = 10000
+
+    # Generate the output directory
+    os.makedirs(config['outputs']['path'], exist_ok=True)
+    utils.generate_output_directory(
+        config=config
+    )
+
+    # Generate and write the extractions
+    t1 = time.time()
+    ExtractionGenerator(seed=0).write(
+        n=n,
+        dirName=os.path.join(
+            config['outputs']['path'],
+            config['outputs']['root'],
+            'extractions'
+        )
+    )
+    t2 = time.time()
+
+    # Log
+    print(
+        'Extractions: %s, Run-time: %s' % (
+            n,
+            str(dt.timedelta(seconds=(t2-t1)))
+        )
+    )
@@ -12,22 +12,86 @@ extraction time-series.
 
 # Import modules
 import os
+import copy
+import time
+import json
+import zlib
+import hashlib
+import sqlite3
+import heapq
+import collections
+import concurrent.futures
 import scipy
 import numpy as np
 import matplotlib.pyplot as plt
 from numpy.core.multiarray import interp as compiled_interp
+from ospro.algorithms.pre_infusion_detector import (
+    PreInfusionDetector as PreInfusionDetector
+)
+
+# Import shared memory (Python 3.8+)
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
 
 
 # Define pressure profile fitting algorithm class
 class EPFA():
 
+    # Supported search strategies
+    #   exhaustive = Scores every profile within the Cartesian product of
+    #       the candidate pre-infusion and extraction values.
+    #   dp         = Scores the same candidate space by dynamic programming
+    #       over the chain of profile knots.
+    #   gram       = Scores every profile within the same candidate space
+    #       from the Gram matrix of the hat-basis, without simulating the
+    #       pressure profiles.
+    #   multires   = Scores a coarse candidate space, then refines the best
+    #       profiles within shrinking windows of finer pressure resolution.
+    #   bnb        = Searches the same candidate space by branch-and-bound
+    #       over the chain of profile knots, pruning the profiles whose
+    #       lower bound of the squared error exceeds the best so far.
+    #   lstsq      = Fits the continuous knot pressure values by least-squares
+    #       for each pre-infusion duration, then searches the neighbourhood
+    #       of the nearest profile within the same candidate space.
+    #   freeknot   = Frees the knot times of the extraction from the
+    #       quartiles and selects the knot times and pressure values by
+    #       dynamic programming over the chain of knots.
+    SOLVERS = (
+        'exhaustive', 'dp', 'gram', 'multires', 'bnb', 'lstsq', 'freeknot'
+    )
+
+    # Supported decimation methods
+    #   mean = Replaces each block of consecutive samples by its mean, an
+    #       anti-aliasing low-pass filter followed by down-sampling.
+    #   lttb = Keeps the sample of each block that forms the largest
+    #       triangle with the neighbouring blocks (largest-triangle-three-
+    #       buckets), which preserves the shape of the pressure series.
+    DECIMATIONS = ('mean', 'lttb')
+
+    # Version of the algorithm, part of the key of each cached solution.
+    #   Increment when a change alters the solutions.
+    VERSION = '1.0.0'
+
     def __init__(
         self,
         TIME_INTERVAL=0.1,
         START_DELAY=1,
         EXTRACTION_DURATION_MIN=10,
         INFUSION_DURATION_LIMIT=30,
-        INFUSION_LIMIT=4
+        INFUSION_LIMIT=4,
+        solver='exhaustive',
+        resolutions=(1, 0.5, 0.1),
+        beam=3,
+        top_k=1,
+        cache=None,
+        hook=None,
+        max_points=None,
+        decimation='mean',
+        resample=True,
+        knot_interval=0.5,
+        library=None
     ):
         """
         Variables
@@ -44,6 +108,54 @@ class EPFA():
                                         (seconds) for pre-infusion.
         INFUSION_LIMIT          =  <int> Maximum pressure (bars) for
                                         pre-infusion.
+        solver                  =  <str> Search strategy used to select the
+                                        best fitted pressure profile, one of
+                                        'exhaustive', 'dp', 'gram',
+                                        'multires', 'bnb', 'lstsq' or
+                                        'freeknot'.
+        resolutions             =  <tuple> Pressure resolution (bars) of
+                                        each search of the 'multires'
+                                        solver, from coarse to fine.
+        beam                    =  <int> Number of the best profiles of
+                                        each search of the 'multires'
+                                        solver refined by the next search.
+        top_k                   =  <int> Number of the best profiles to
+                                        report with the solution. Reported
+                                        by the searches that score every
+                                        simulation, not by the 'dp', 'bnb',
+                                        'multires', 'lstsq' and 'freeknot'
+                                        solvers.
+        cache                   =  <SolutionCache> Optional store of the
+                                        solutions of {solve}, keyed by the
+                                        extraction series, the algorithm
+                                        parameters and {VERSION}.
+        hook                    =  <callable> Optional function called with
+                                        the timings of each solve, e.g. to
+                                        feed a metrics system. Must be
+                                        picklable when solving with more
+                                        than one worker.
+        max_points              =  <int> Optional maximum number of time
+                                        values used to score the profiles.
+                                        Longer series are decimated before
+                                        the search, and the best profile is
+                                        still reported at full resolution.
+                                        The errors of the decimated series,
+                                        with the best profiles of {top_k},
+                                        are reported under 'decimation'.
+        decimation              =  <str> Decimation method, one of 'mean'
+                                        or 'lttb'.
+        resample                =  <bool> Resamples Time series that are not
+                                        uniform at {TIME_INTERVAL}, e.g. with
+                                        jitter or dropped samples, onto a
+                                        uniform grid before the solve.
+        knot_interval           =  <float> Interval (seconds) of the
+                                        possible knot times of the
+                                        'freeknot' solver.
+        library                 =  <ProfileLibrary> Optional index of the
+                                        stored pressure profiles. An
+                                        extraction that matches a stored
+                                        profile returns the stored profile
+                                        without a search.
 
         Description
         ---------------------------------------------------------------------
@@ -59,680 +171,4407 @@ class EPFA():
         self.TIME_INTERVAL_CONVERSION = np.round(
             1 / TIME_INTERVAL, decimals=0
         ).astype(int)
+        self.detector = PreInfusionDetector(
+            TIME_INTERVAL=TIME_INTERVAL,
+            START_DELAY=START_DELAY,
+            INFUSION_LIMIT=INFUSION_LIMIT
+        )
+
+        # Validate the solver
+        if solver not in self.SOLVERS:
+            raise ValueError(
+                'ERROR: Invalid solver {%s}. Expected one of [%s].' % (
+                    solver,
+                    ', '.join(self.SOLVERS)
+                )
+            )
+        self.solver = solver
+        self.resolutions = tuple(resolutions)
+        self.beam = beam
+        self.top_k = top_k
+        self.cache = cache
+        self.hook = hook
+
+        # Validate the decimation
+        if decimation not in self.DECIMATIONS:
+            raise ValueError(
+                'ERROR: Invalid decimation {%s}. Expected one of [%s].' % (
+                    decimation,
+                    ', '.join(self.DECIMATIONS)
+                )
+            )
+        if (max_points is not None) and (max_points < 3):
+            raise ValueError(
+                'ERROR: Invalid max_points {%s}. Expected at least 3.' % (
+                    max_points
+                )
+            )
+        self.max_points = max_points
+        self.decimation = decimation
+        self.resample = resample
+        self.knot_interval = knot_interval
+        self.library = library
 
     def solve(
         self,
         x,
-        y
+        y,
+        max_bytes=None,
+        workers=1,
+        time_budget=None,
+        prior=None
     ):
         """
         Variables
         ---------------------------------------------------------------------
         x                       = <np.array()> Vector of the Time series
         y                       = <np.array()> Vector of the Pressure series
+        max_bytes               = <int> Optional memory limit (bytes) for
+                                    scoring the simulations. When provided,
+                                    the simulations are generated and scored
+                                    in chunks that fit within {max_bytes}.
+                                    Not used by the 'dp', 'freeknot',
+                                    'multires', 'bnb' and 'lstsq' solvers.
+        workers                 = <int> Number of worker processes that
+                                    score the simulations. Not used by the
+                                    'dp', 'freeknot', 'multires', 'bnb' and
+                                    'lstsq' solvers.
+        time_budget             = <float> Optional wall-clock limit (seconds)
+                                    for the solve. When provided, the
+                                    simulations are scored outward from the
+                                    smoothed quintile means until the limit
+                                    is reached, and the best profile so far
+                                    is returned. Not used by the 'dp',
+                                    'freeknot', 'multires', 'bnb' and
+                                    'lstsq' solvers.
+        prior                   = <np.array()> Optional espresso extraction
+                                    parameters of a prior profile, e.g. of
+                                    the active pressure profile config from
+                                    {prior_profile}. When provided, the
+                                    simulations are scored outward from the
+                                    prior profile by {solve_warm}, which
+                                    stops at the first profile that no
+                                    neighbouring profile improves on, a
+                                    local minimum rather than the best
+                                    profile of the candidate space. Not
+                                    used by the 'dp', 'freeknot',
+                                    'multires', 'bnb' and 'lstsq' solvers.
 
         Description
         ---------------------------------------------------------------------
         Performs an OLS algorithm that determines the best fitted
         pressure profile from espresso extraction time series
-        data.
+        data. The run-time of each stage is reported in
+        {solution['ppfa']['timings']}, as described by
+        {initialize_timings}.
         """
 
-        # Determine the possible local infusion and extraction
-        #   pressure values
-        xti, ypi, yp0, yp1, yp2, yp3, yp4, ysmoothed = self.reduce(x=x, y=y)
+        timings = self.initialize_timings()
+        t0 = time.perf_counter_ns()
 
-        # Simulate the possible espresso extraction profiles
-        maty0, profiles = self.simulate_profiles(
-            x=x,
-            xti=xti,
-            ypi=ypi,
-            yp0=yp0,
-            yp1=yp1,
-            yp2=yp2,
-            yp3=yp3,
-            yp4=yp4
-        )
+        # Initialize the deadline
+        if time_budget is not None:
+            deadline = time.perf_counter() + time_budget
+        else:
+            deadline = None
+
+        # Resample the series onto a uniform grid
+        if self.resample:
+            x, y = self.resample_series(x=x, y=y)
+            timings['resample'] = time.perf_counter_ns() - t0
 
-        # Perform the OLS algorithm to,
-        #   determine the pressure profile with the minimum
-        #   error with the espresso extraction series data
-        solution = self.fit_profile(
-            maty0=maty0,
-            y=y
+        # Return the matched stored pressure profile or the cached
+        #   solution
+        #   A solution within a time budget depends on the speed of the
+        #   machine, and a solution from a prior profile depends on the
+        #   prior, so neither is read from nor written to the cache.
+        solution, match, key = self.stored_solution(
+            x=x,
+            y=y,
+            timings=timings,
+            t0=t0,
+            cacheable=(deadline is None) and (prior is None)
         )
+        if solution is not None:
+            return solution
 
-        # Unpack the solution
-        if len(profiles[solution['id']]) > 5:
-            infusionDuration, infusionPressure, p0, p1, p2, p3, p4 = (
-                profiles[solution['id']]
-            )
-        else:
-            infusionDuration = 0
-            infusionPressure = 0
-            p0, p1, p2, p3, p4 = (
-                profiles[solution['id']]
-            )
+        # Determine the possible local infusion and extraction
+        #   pressure values
+        t1 = time.perf_counter_ns()
+        reduced = self.reduce(x=x, y=y)
+        timings['reduce'] = time.perf_counter_ns() - t1
 
-        return {
-            'settings': {
-                'name': 'User_1',
-                'type': 'User',
-                'extractionDuration': float(x[-1]),
-                'infusionDuration': int(infusionDuration),
-                'infusionPressure': int(infusionPressure),
-                'p0': int(p0),
-                'p1': int(p1),
-                'p2': int(p2),
-                'p3': int(p3),
-                'p4': int(p4),
-                'timeLst': x.tolist(),
-                'pressureProfileLst': np.round(
-                    maty0[solution['id']],
-                    1
-                ).tolist(),
-                'pressureSeries': y.tolist(),
-                'pressureSeriesSmoothed': ysmoothed.tolist()
-            },
-            'ppfa': solution
-        }
+        return self.solve_reduced(
+            x=x,
+            y=y,
+            reduced=reduced,
+            max_bytes=max_bytes,
+            workers=workers,
+            deadline=deadline,
+            timings=timings,
+            t0=t0,
+            prior=prior,
+            key=key,
+            match=match
+        )
 
-    def reduce(
+    def stored_solution(
         self,
         x,
-        y
+        y,
+        timings,
+        t0,
+        cacheable=True
     ):
         """
         Variables
         ---------------------------------------------------------------------
         x                       = <np.array()> Vector of the Time series
         y                       = <np.array()> Vector of the Pressure series
-        START_DELAY             = <int> Period of duration in time (seconds)
-                                    to omit from the expresso extraction
-                                    time-series.
-        INFUSION_DURATION_LIMIT = <int> Maximum period of duration in
-                                    time (seconds) for pre-infusion.
-        INFUSION_LIMIT          = <int> Maximum pressure (bars)
-                                    considered to be pre-infusion.
+        timings                 = <dict> Timings of {initialize_timings}
+        t0                      = <int> Value of {time.perf_counter_ns()}
+                                    at the start of the solve
+        cacheable               = <bool> Determines whether the solution is
+                                    read from the cache
 
         Description
         ---------------------------------------------------------------------
-        Simplifies the espresso extraction time-series, using the
-        Ramer-Douglas-Peucker (RDP) algorithm, to identify local pressure
-        values for the simulation and selection of the best fitted pressure
-        profile.
+        Returns the solution of {solve} from the stored pressure profile
+        of the library within its tolerance, or from the cache, with the
+        match of the library and the key of the cache. Without a stored
+        solution the solution is {None}, and the key is {None} when the
+        solution is not cacheable. A stored solution completes the
+        timings and passes them to the hook.
         """
 
-        # Apply smoothing
-        ysmoothed = np.array(
-            scipy.ndimage.uniform_filter1d(
-                y,
-                size=7,
-                mode='reflect'
-            )
-        )
-
-        # Determine the first index where pressure exceeds
-        #   the pre-infusion pressure limit
-        INFUSION_DURATION_INDEX = np.round(
-            np.argmax(
-                ysmoothed[
-                    np.round(
-                        self.START_DELAY * self.TIME_INTERVAL_CONVERSION,
-                        decimals=0
-                    ):
-                ] >= self.INFUSION_LIMIT
-            ) + np.round(
-                self.START_DELAY * self.TIME_INTERVAL_CONVERSION,
-                decimals=0
-            ),
-            decimals=0
-        )
-
-        # Evaluate pre-infusion
-        if (
-            (
-                ysmoothed.shape[0] >= np.round(
-                    (
-                        self.EXTRACTION_DURATION_MIN *
-                        self.TIME_INTERVAL_CONVERSION
-                    ),
-                    decimals=0
-                )
-            ) and
-            (
-                INFUSION_DURATION_INDEX > np.round(
-                    self.START_DELAY * self.TIME_INTERVAL_CONVERSION,
-                    decimals=0
-                )
-            )
-        ):
-
-            # Derive pre-infusion duration values
-            xti = self.reduce_range(
-                a=x[
-                    np.round(
-                        (
-                            INFUSION_DURATION_INDEX -
-                            self.TIME_INTERVAL_CONVERSION
-                        ),
-                        decimals=0
-                    ):INFUSION_DURATION_INDEX
-                ]
-            )
-
-            # Derive local extraction pressure values
-            ypi = self.reduce_range(a=ysmoothed[:np.where(x == xti[-1])[0][0]])
-            yp0, yp1, yp2, yp3, yp4 = (
-                self.derive_local_extraction_pressure_ranges(
+        # Match the stored pressure profiles
+        match = None
+        if self.library is not None:
+            t1 = time.perf_counter_ns()
+            profile, distance = self.library.match(x=x, y=y)
+            if profile is not None:
+                match = {
+                    'name': profile['settings']['name'],
+                    'distance': float(np.round(distance, 6))
+                }
+            else:
+                match = {
+                    'name': None,
+                    'distance': None
+                }
+            timings['match'] = time.perf_counter_ns() - t1
+            if distance <= self.library.tolerance:
+                t1 = time.perf_counter_ns()
+                solution = self.library_solution(
                     x=x,
-                    y=ysmoothed,
-                    xti=xti
+                    y=y,
+                    profile=profile,
+                    match=match
                 )
-            )
-            yp0 = self.reduce_range(a=yp0)
-            yp1 = self.reduce_range(a=yp1)
-            yp2 = self.reduce_range(a=yp2)
-            yp3 = self.reduce_range(a=yp3)
-            yp4 = self.reduce_range(a=yp4)
+                solution['ppfa']['timings'] = timings
+                timings['package'] = time.perf_counter_ns() - t1
+                self.report_timings(timings=timings, t0=t0)
 
-        else:
+                return solution, match, None
 
-            # Derive pre-infusion duration values
-            xti = np.array([0])
+        # Read the cache
+        if (self.cache is None) or (not cacheable):
+            return None, match, None
 
-            # Derive local extraction pressure values
-            ypi = np.array([])
-            yp0, yp1, yp2, yp3, yp4 = (
-                self.derive_local_extraction_pressure_ranges(
-                    x=x,
-                    y=ysmoothed,
-                    xti=xti
-                )
+        t1 = time.perf_counter_ns()
+        key = self.cache_key(x=x, y=y)
+        cached = self.cache.get(key=key)
+        timings['cache'] = time.perf_counter_ns() - t1
+        if cached is not None:
+            t1 = time.perf_counter_ns()
+            cached['ppfa']['cacheHit'] = True
+            cached['ppfa']['timings'] = timings
+            if match is not None:
+                cached['ppfa']['match'] = match
+            solution = self.package_solution(
+                x=x,
+                y=y,
+                ysmoothed=self.smooth(y=y),
+                profile=np.array(cached['profile']),
+                solution=cached['ppfa']
             )
-            yp0 = self.reduce_range(a=yp0)
-            yp1 = self.reduce_range(a=yp1)
-            yp2 = self.reduce_range(a=yp2)
-            yp3 = self.reduce_range(a=yp3)
-            yp4 = self.reduce_range(a=yp4)
+            timings['package'] = time.perf_counter_ns() - t1
+            self.report_timings(timings=timings, t0=t0)
 
-        # Return local pressure values
-        return xti, ypi, yp0, yp1, yp2, yp3, yp4, ysmoothed
+            return solution, match, None
 
-    def derive_local_extraction_pressure_ranges(
+        return None, match, key
+
+    def library_solution(
         self,
         x,
         y,
-        xti
+        profile,
+        match
     ):
         """
         Variables
         ---------------------------------------------------------------------
         x                       = <np.array()> Vector of the Time series
         y                       = <np.array()> Vector of the Pressure series
-        xti                     = <np.array()> Vector of possible pre-infusion
-                                    duration values (seconds)
+        profile                 = <dict> Dictionary object of the matched
+                                    pressure profile config
+        match                   = <dict> Name and distance of the match
 
         Description
         ---------------------------------------------------------------------
-        Returns a range of unique intager values from {a}.
+        Returns the solution of {solve} from the settings of a matched
+        stored pressure profile, with its pressure profile at the time
+        values {x}.
         """
 
-        return np.array_split(
-            ary=y[np.where(x == xti[-1])[0][0]:],
-            indices_or_sections=5
+        # Derive the pressure profile at the time values
+        pressureProfile = compiled_interp(
+            x=x,
+            xp=np.array(profile['settings']['timeLst'], dtype=float),
+            fp=np.array(
+                profile['settings']['pressureProfileLst'],
+                dtype=float
+            )
         )
 
-    def reduce_range(
+        settings = copy.deepcopy(profile['settings'])
+        settings['timeLst'] = x.tolist()
+        settings['pressureProfileLst'] = np.round(
+            pressureProfile,
+            1
+        ).tolist()
+        settings['pressureSeries'] = y.tolist()
+        settings['pressureSeriesSmoothed'] = self.smooth(y=y).tolist()
+
+        return {
+            'settings': settings,
+            'ppfa': {
+                'id': None,
+                'sse': float(np.round(np.linalg.norm(pressureProfile - y), 6)),
+                'simulations': 0,
+                'solver': 'library',
+                'match': match
+            }
+        }
+
+    def initialize_timings(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Returns a dictionary object of the run-time (nanoseconds) of each
+        stage of {solve},
+            resample       = Resampling the series onto a uniform grid
+            match          = Matching the stored pressure profiles
+            cache          = Reading and writing the solution cache
+            reduce         = Smoothing and deriving the candidate ranges
+            candidates     = Indexing the candidate space
+            decimation     = Decimating the series scored by the search
+            simulation     = Simulating the pressure profiles, only
+                                separated from the fitting by the
+                                'exhaustive' solver
+            fitting        = Scoring and selecting the best profile
+            package        = Deriving the settings of the solution
+            total          = The whole solve,
+        and of the size of the search,
+            candidateCount = Number of profiles in the candidate space
+            matrixBytes    = Peak size (bytes) of the simulated or decoded
+                                candidate matrix of the 'exhaustive' and
+                                'gram' solvers and of the streaming search.
+        """
+
+        return {
+            'resample': 0,
+            'match': 0,
+            'cache': 0,
+            'reduce': 0,
+            'candidates': 0,
+            'simulation': 0,
+            'fitting': 0,
+            'decimation': 0,
+            'package': 0,
+            'total': 0,
+            'candidateCount': 0,
+            'matrixBytes': 0
+        }
+
+    def report_timings(
         self,
-        a
+        timings,
+        t0
     ):
         """
         Variables
         ---------------------------------------------------------------------
-        a                       = <np.array()> Vector
+        timings                 = <dict> Timings of {initialize_timings}
+        t0                      = <int> Value of {time.perf_counter_ns()}
+                                    at the start of the solve
 
         Description
         ---------------------------------------------------------------------
-        Returns a range of unique intager values from {a}.
+        Completes the total run-time of {timings} and passes {timings} to
+        the hook.
         """
 
-        return np.arange(
-            start=np.floor(np.max(np.array([np.min(a), 1]))),
-            stop=np.round(
-                np.ceil(np.max(a) + 1),
-                decimals=0
-            ),
-            step=1
-        )
+        timings['total'] = time.perf_counter_ns() - t0
+        if self.hook is not None:
+            self.hook(timings)
 
-    def simulate_profiles(
+    def solve_reduced(
         self,
         x,
-        xti,
-        ypi,
-        yp0,
-        yp1,
-        yp2,
-        yp3,
-        yp4,
+        y,
+        reduced,
+        max_bytes=None,
+        workers=1,
+        deadline=None,
+        timings=None,
+        t0=None,
+        prior=None,
+        key=None,
+        match=None
     ):
         """
         Variables
         ---------------------------------------------------------------------
         x                       = <np.array()> Vector of the Time series
-        xti                     = <np.array()> Vector of possible pre-infusion
-                                    duration values (seconds)
-        ypi                     = <np.array()> Vector of possible pre-infusion
-                                    pressure values (bars)
-        yp0                     = <np.array()> Vector of possible extraction
-                                    pressure values (bars) for the 1st quartile
-        yp1                     = <np.array()> Vector of possible extraction
-                                    pressure values (bars) for the 2nd quartile
-        yp2                     = <np.array()> Vector of possible extraction
-                                    pressure values (bars) for the 3rd quartile
-        yp3                     = <np.array()> Vector of possible extraction
-                                    pressure values (bars) for the 4th quartile
-        yp4                     = <np.array()> Vector of possible extraction
-                                    pressure values (bars) for the 5th quartile
+        y                       = <np.array()> Vector of the Pressure series
+        reduced                 = <tuple> Local pressure values of {reduce}
+        max_bytes               = <int> Optional memory limit (bytes) for
+                                    scoring the simulations
+        workers                 = <int> Number of worker processes that
+                                    score the simulations
+        deadline                = <float> Optional value of
+                                    {time.perf_counter()} after which the
+                                    search stops
+        timings                 = <dict> Optional timings of
+                                    {initialize_timings}, with the run-time
+                                    of the resampling and of {reduce}
+        t0                      = <int> Optional value of
+                                    {time.perf_counter_ns()} at the start of
+                                    the solve, by default the start of the
+                                    call
+        prior                   = <np.array()> Optional espresso extraction
+                                    parameters of a prior profile
+        key                     = <str> Optional key of the cache of
+                                    {stored_solution} under which the
+                                    solution is written
+        match                   = <dict> Optional match of the library of
+                                    {stored_solution}
 
         Description
         ---------------------------------------------------------------------
-        Simulates espresso extraction profiles.
+        Determines the best fitted pressure profile from the local
+        pressure values of {reduce}, as described by {solve}. The timings
+        are completed and passed to the hook, as by {solve}.
         """
 
-        # Initialize simulation objects
-        profiles = []
-        maty0 = np.array([[]]).reshape(0, x.shape[0])
-
-        # Simulate pre-infusion pressure profiles
-        if ypi.shape[0] > 0:
-            sinfusion = np.array(
-                np.meshgrid(
-                    xti,
-                    ypi,
-                    yp0,
-                    yp1,
-                    yp2,
-                    yp3,
-                    yp4
-                )
-            ).transpose().reshape(-1, 7)
+        if t0 is None:
+            t0 = time.perf_counter_ns()
+        if timings is None:
+            timings = self.initialize_timings()
 
-            profiles = profiles + sinfusion.tolist()
+        result = self.solve_space(
+            x=x,
+            y=y,
+            reduced=reduced,
+            max_bytes=max_bytes,
+            workers=workers,
+            deadline=deadline,
+            timings=timings,
+            prior=prior
+        )
 
-            maty0 = np.concatenate(
-                (
-                    maty0,
-                    np.apply_along_axis(
-                        func1d=self.interpolate,
-                        axis=1,
-                        arr=sinfusion,
-                        x=x
-                    )
-                ),
-                axis=0
+        # Cache the solution
+        if key is not None:
+            t1 = time.perf_counter_ns()
+            self.cache.put(
+                key=key,
+                value={
+                    'profile': result['profile'],
+                    'ppfa': {
+                        k: v for k, v in result['ppfa'].items()
+                        if k != 'timings'
+                    }
+                }
             )
+            result['ppfa']['cacheHit'] = False
+            timings['cache'] += time.perf_counter_ns() - t1
 
-        # Simulate extraction pressure profiles
-        else:
-            sextraction = np.array(
-                np.meshgrid(
-                    yp0,
-                    yp1,
-                    yp2,
-                    yp3,
-                    yp4
-                )
-            ).transpose().reshape(-1, 5)
-
-            profiles = profiles + sextraction.tolist()
+        if match is not None:
+            result['ppfa']['match'] = match
+        self.report_timings(timings=timings, t0=t0)
 
-            maty0 = np.concatenate(
-                (
-                    maty0,
-                    np.apply_along_axis(
-                        func1d=self.interpolate,
-                        axis=1,
-                        arr=sextraction,
-                        x=x
-                    )
-                ),
-                axis=0
-            )
-
-        return maty0, profiles
+        return result['solution']
 
-    def interpolate(
+    def solve_space(
         self,
-        a,
-        x
+        x,
+        y,
+        reduced,
+        max_bytes=None,
+        workers=1,
+        deadline=None,
+        timings=None,
+        prior=None
     ):
         """
         Variables
         ---------------------------------------------------------------------
-        a                       = <np.array()> Simulated espresso extraction
-                                    parameters in the following order,
-                                    {inf. dur}, {inf. pres}, {p0}, {p1}, {p2},
-                                    {p3}, {p4}. With pre-infusion {a} has
-                                    shape (7, ). Otherwise shape (5, ).
         x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        reduced                 = <tuple> Local pressure values of {reduce}
+        max_bytes               = <int> Optional memory limit (bytes) for
+                                    scoring the simulations
+        workers                 = <int> Number of worker processes that
+                                    score the simulations
+        deadline                = <float> Optional value of
+                                    {time.perf_counter()} after which the
+                                    search stops
+        timings                 = <dict> Optional timings of
+                                    {initialize_timings}
+        prior                   = <np.array()> Optional espresso extraction
+                                    parameters of a prior profile
 
         Description
         ---------------------------------------------------------------------
-        Derives a possible extraction profile as a linear interpolation.
+        Returns a dictionary object of the parameters of the best fitted
+        pressure profile {profile}, the solution of the search {ppfa} and
+        the packaged solution of {solve} {solution}. The run-time of each
+        stage is recorded in {timings}, as described by
+        {initialize_timings}. The 'dp', 'freeknot', 'multires', 'bnb' and
+        'lstsq' solvers search the candidate space by their own strategy,
+        and ignore {max_bytes}, {workers}, {deadline} and {prior}.
         """
 
-        # Generate the x and y coordinates for a pre-infusion pressure profile
-        #   xp = np.array([
-        #       0,
-        #       {inf. dur},
-        #       {t0},
-        #       {t1},
-        #       {t2},
-        #       {t3},
-        #       {t4}
-        #   ])
-        #   fp = np.array([
-        #       {inf. pres},
-        #       {inf. pres},
-        #       {p0},
-        #       {p1},
-        #       {p2},
-        #       {p3},
-        #       {p4}
-        #   ])
-        if a.shape[0] > 5:
-            xp = np.concatenate(
-                (
-                    np.array([0, a[0]]),
-                    np.array(self.calculate_quartiles(
-                            a=a,
-                            xduration=x[-1]
-                        )
+        if timings is None:
+            timings = self.initialize_timings()
+
+        xti, ypi, yp0, yp1, yp2, yp3, yp4, ysmoothed = reduced
+
+        # Index the possible espresso extraction parameters
+        t1 = time.perf_counter_ns()
+        space = CandidateSpace(
+            xti=xti,
+            ypi=ypi,
+            yp0=yp0,
+            yp1=yp1,
+            yp2=yp2,
+            yp3=yp3,
+            yp4=yp4
+        )
+        timings['candidates'] = time.perf_counter_ns() - t1
+        timings['candidateCount'] = int(space.size)
+
+        # Decimate the series scored by the search
+        t1 = time.perf_counter_ns()
+        xfit, yfit, factor = self.decimate(x=x, y=y)
+        timings['decimation'] = time.perf_counter_ns() - t1
+        t1 = time.perf_counter_ns()
+
+        # Select the pressure profile with the minimum error with the
+        #   espresso extraction series data by dynamic programming
+        if self.solver == 'dp':
+            profile, solution = self.solve_dp(
+                x=xfit,
+                y=yfit,
+                space=space
+            )
+
+        # Select the knot times and pressure values with the minimum
+        #   error by dynamic programming
+        elif self.solver == 'freeknot':
+            profile, solution = self.solve_freeknot(
+                x=xfit,
+                y=yfit,
+                space=space
+            )
+
+        # Score a coarse candidate space and refine the best profiles
+        #   at finer pressure resolutions
+        elif self.solver == 'multires':
+            profile, solution = self.solve_multires(
+                x=xfit,
+                y=yfit,
+                space=space
+            )
+
+        # Search the pressure profile with the minimum error by
+        #   branch-and-bound
+        elif self.solver == 'bnb':
+            profile, solution = self.solve_bnb(
+                x=xfit,
+                y=yfit,
+                space=space
+            )
+
+        # Fit the continuous knot pressure values and search the
+        #   neighbourhood of the nearest profile
+        elif self.solver == 'lstsq':
+            profile, solution = self.solve_lstsq(
+                x=xfit,
+                y=yfit,
+                space=space
+            )
+
+        # Score the simulations outward from the prior profile until no
+        #   neighbouring profile is better, or until the deadline
+        elif prior is not None:
+            profile, solution = self.solve_warm(
+                x=xfit,
+                y=yfit,
+                space=space,
+                center=self.prior_center(
+                    prior=prior,
+                    center=self.center_profile(
+                        x=x,
+                        ysmoothed=ysmoothed,
+                        xti=xti,
+                        ypi=ypi
                     )
-                )
+                ),
+                deadline=deadline
             )
-            fp = np.concatenate(
-                (
-                    np.array([a[1], a[1]]),
-                    a[2:]
+
+        # Score the simulations outward from the smoothed quintile means
+        #   until the deadline
+        elif deadline is not None:
+            profile, solution = self.solve_anytime(
+                x=xfit,
+                y=yfit,
+                space=space,
+                center=self.center_profile(
+                    x=x,
+                    ysmoothed=ysmoothed,
+                    xti=xti,
+                    ypi=ypi
                 ),
-                axis=None
+                deadline=deadline
             )
 
-        # Generate the x and y coordinates for an extraction pressure profile
-        #   xp = np.array([
-        #       {t0},
-        #       {t1},
-        #       {t2},
-        #       {t3},
-        #       {t4}
-        #   ])
-        #   fp = np.array([
-        #       {p0},
-        #       {p1},
-        #       {p2},
-        #       {p3},
-        #       {p4}
-        #   ])
+        # Simulate and score the possible espresso extraction profiles
+        #   in chunks of bounded memory, across worker processes
+        elif (max_bytes is not None) or (workers > 1):
+            profile, solution = self.solve_streaming(
+                x=xfit,
+                y=yfit,
+                space=space,
+                max_bytes=max_bytes,
+                workers=workers
+            )
+
+        # Score the simulations from the Gram matrix
+        elif self.solver == 'gram':
+            a = space.decode(index=np.arange(space.size))
+            timings['matrixBytes'] = int(a.nbytes)
+            solution = self.select_profile(
+                sse=self.score_profiles(
+                    x=xfit,
+                    y=yfit,
+                    a=a
+                )
+            )
+            solution['solver'] = self.solver
+            profile = space.decode(index=np.array([solution['id']]))[0]
+
         else:
-            xp = self.calculate_quartiles(
-                a=a,
-                xduration=x[-1]
+
+            # Simulate the possible espresso extraction profiles
+            maty0, profiles = self.simulate_profiles(
+                x=xfit,
+                xti=xti,
+                ypi=ypi,
+                yp0=yp0,
+                yp1=yp1,
+                yp2=yp2,
+                yp3=yp3,
+                yp4=yp4
             )
-            fp = np.copy(a)
+            timings['simulation'] = time.perf_counter_ns() - t1
+            timings['matrixBytes'] = int(maty0.nbytes)
+            t1 = time.perf_counter_ns()
 
-        # Derive a possible pressure profile as a linear interpolation
-        return compiled_interp(
+            # Perform the OLS algorithm to,
+            #   determine the pressure profile with the minimum
+            #   error with the espresso extraction series data
+            solution = self.fit_profile(
+                maty0=maty0,
+                y=yfit
+            )
+            solution['solver'] = self.solver
+            profile = profiles.decode(index=np.array([solution['id']]))[0]
+
+        # Report the error of the best profile at full resolution, and
+        #   record the errors of the decimated series, including the best
+        #   profiles and the margin of victory, with the decimation
+        if factor > 1:
+            solution['decimation'] = {
+                'method': self.decimation,
+                'factor': factor,
+                'points': int(xfit.shape[0]),
+                'sse': solution['sse']
+            }
+            for k in ('topK', 'margin', 'relativeMargin'):
+                if k in solution:
+                    solution['decimation'][k] = solution.pop(k)
+            solution['sse'] = float(np.round(
+                np.linalg.norm(
+                    self.render_solution(
+                        profile=profile,
+                        solution=solution,
+                        x=x
+                    ) - y
+                ),
+                6
+            ))
+
+        # Record the peak size of the candidate matrix of the streaming
+        #   search
+        if 'chunkBytes' in solution:
+            timings['matrixBytes'] = solution.pop('chunkBytes')
+
+        # Decode the parameters of the best profiles
+        if 'topK' in solution.get('decimation', solution):
+            for candidate in solution.get('decimation', solution)['topK']:
+                candidate['profile'] = space.decode(
+                    index=np.array([candidate['id']])
+                )[0].tolist()
+        timings['fitting'] = time.perf_counter_ns() - t1
+
+        # Package the solution
+        t1 = time.perf_counter_ns()
+        package = self.package_solution(
             x=x,
-            xp=xp,
-            fp=fp
+            y=y,
+            ysmoothed=ysmoothed,
+            profile=profile,
+            solution=solution
         )
+        solution['timings'] = timings
+        timings['package'] = time.perf_counter_ns() - t1
 
-    def calculate_quartiles(
+        return {
+            'profile': profile.tolist(),
+            'ppfa': solution,
+            'solution': package
+        }
+
+    def render_solution(
         self,
-        a,
-        xduration,
+        profile,
+        solution,
+        x
     ):
         """
         Variables
         ---------------------------------------------------------------------
-        a                       = <np.array()> Simulated espresso extraction
-                                    parameters in the following order,
-                                    {inf. dur}, {inf. pres}, {p0}, {p1}, {p2},
-                                    {p3}, {p4}. With pre-infusion {a} has
-                                    shape (7, ). Otherwise shape (5, ).
-        xduration               = <float> The value of the duration of the
-                                    time series
+        profile                 = <np.array()> Vector of the parameters of
+                                    the best fitted pressure profile
+        solution                = <dict> Solution of the search
+        x                       = <np.array()> Vector of the Time series
 
         Description
         ---------------------------------------------------------------------
-        Calculates the quartiles of the espresso extraction time series
-        for linear interpolation.
+        Returns the pressure profile of the solution at the time values
+        {x}, from the free knots of the 'freeknot' solver when present.
+        Otherwise from the knots at the quartiles of {profile}.
         """
 
-        # Derive the start time from the simulated espresso extraction
-        #   parameters
-        if a.shape[0] > 5:
-            x0 = np.round(a[0] + 1, decimals=0)
+        if 'knots' in solution:
+            return compiled_interp(
+                x=x,
+                xp=np.array(solution['knots']['times']),
+                fp=np.array(solution['knots']['pressures'])
+            )
         else:
-            x0 = 0
+            return self.interpolate(a=profile, x=x)
 
-        # Return the x coordinates of the espresso extraction quartiles
-        return np.quantile(
-            np.arange(
-                start=x0,
-                stop=np.round(
-                    xduration + 0.1,
-                    decimals=1
-                ),
-                step=0.1
-            ),
-            q=np.array([0, 0.25, 0.5, 0.75, 1]),
-            axis=0
+    def package_solution(
+        self,
+        x,
+        y,
+        ysmoothed,
+        profile,
+        solution
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        ysmoothed               = <np.array()> Vector of the smoothed
+                                    Pressure series
+        profile                 = <np.array()> Vector of the parameters of
+                                    the best fitted pressure profile
+        solution                = <dict> Solution of the search
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the profile settings and the solution of {solve}.
+        """
+
+        # Only derive the pressure profile of the solution
+        pressureProfile = self.render_solution(
+            profile=profile,
+            solution=solution,
+            x=x
         )
 
-    def fit_profile(
+        # Unpack the solution
+        if profile.shape[0] > 5:
+            infusionDuration, infusionPressure, p0, p1, p2, p3, p4 = profile
+        else:
+            infusionDuration = 0
+            infusionPressure = 0
+            p0, p1, p2, p3, p4 = profile
+
+        return {
+            'settings': {
+                'name': 'User_1',
+                'type': 'User',
+                'extractionDuration': float(x[-1]),
+                'infusionDuration': int(infusionDuration),
+                'infusionPressure': self.pressure_value(
+                    p=infusionPressure
+                ),
+                'p0': self.pressure_value(p=p0),
+                'p1': self.pressure_value(p=p1),
+                'p2': self.pressure_value(p=p2),
+                'p3': self.pressure_value(p=p3),
+                'p4': self.pressure_value(p=p4),
+                'timeLst': x.tolist(),
+                'pressureProfileLst': np.round(
+                    pressureProfile,
+                    1
+                ).tolist(),
+                'pressureSeries': y.tolist(),
+                'pressureSeriesSmoothed': ysmoothed.tolist()
+            },
+            'ppfa': solution
+        }
+
+    def cache_key(
         self,
-        maty0,
+        x,
         y
     ):
         """
         Variables
         ---------------------------------------------------------------------
-        maty0                   = <np.array()> Simulated espresso extraction
-                                    profiles
-        y                       = <np.array()> Pressure series
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
 
         Description
         ---------------------------------------------------------------------
-        Returns the simulated pressure profile with the minimal
-        square root of the sum of absolute squared error with the
-        pressure series.
+        Returns the hash of the extraction series, the algorithm parameters
+        and {VERSION} that keys the cached solution.
         """
 
-        # Calculate the frobenius norm of the error
-        sse = np.linalg.norm(maty0-y, axis=1)
-        id = np.argmin(sse)
+        digest = hashlib.sha256()
+        digest.update(
+            repr((
+                self.VERSION,
+                self.TIME_INTERVAL,
+                self.START_DELAY,
+                self.EXTRACTION_DURATION_MIN,
+                self.INFUSION_DURATION_LIMIT,
+                self.INFUSION_LIMIT,
+                self.solver,
+                self.resolutions,
+                self.beam,
+                self.top_k,
+                self.max_points,
+                self.decimation,
+                self.resample,
+                self.knot_interval,
+                len(x)
+            )).encode('utf-8')
+        )
+        digest.update(np.ascontiguousarray(x, dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(y, dtype=float).tobytes())
 
-        return {
-            'id': int(id),
-            'sse': float(np.round(sse[id], 6)),
-            'simulations': int(sse.shape[0])
-        }
+        return digest.hexdigest()
 
-    def plot_solution(
+    def solve_many(
         self,
-        solution,
-        dirName,
-        fileName
+        series,
+        workers=1,
+        max_bytes=None
     ):
         """
         Variables
         ---------------------------------------------------------------------
-        solution                = <dict> Dictionary object of the fitted
-                                    solution
-        dirName                 = <str> Output directory path
-        fileName                = <str> Prefix for the plot file name
+        series                  = <list> List of (x, y) tuples of the Time
+                                    and Pressure series of each extraction
+        workers                 = <int> Number of worker processes
+        max_bytes               = <int> Optional memory limit (bytes) for
+                                    scoring the simulations of each
+                                    extraction
 
         Description
         ---------------------------------------------------------------------
-        Imputes the pressure profile nodes based on the {solution} and
-        smoothed pressure time series and returns the quartiles.
+        Determines the best fitted pressure profile of each extraction in
+        {series} and returns the solutions in the same order. Extractions
+        that share the same Time series are grouped, so the smoothing and
+        the pre-infusion scan are applied to each group at once and the
+        hat-basis is constructed once per group. With more than one worker
+        each group is split into chunks of rows, one per worker, and the
+        chunks are solved in a process pool. The library and the cache are
+        read and written for each extraction, as by {solve}. The timings of
+        each extraction are passed to the hook, as by {solve}, with the
+        run-time of {reduce_many} shared evenly by the extractions of a
+        chunk.
         """
 
-        # Unpack the solution
-        if solution['settings']['infusionDuration'] == 0:
-            scatterXLst = self.calculate_quartiles(
-                a=np.array([
-                    solution['settings']['p0'],
-                    solution['settings']['p1'],
-                    solution['settings']['p2'],
-                    solution['settings']['p3'],
-                    solution['settings']['p4']
-                ]),
-                xduration=solution['settings']['extractionDuration']
-            ).tolist()
-            scatterYLst = [
-                solution['settings']['p0'],
-                solution['settings']['p1'],
-                solution['settings']['p2'],
-                solution['settings']['p3'],
-                solution['settings']['p4']
-            ]
+        # Resample the series onto a uniform grid
+        resampleTimes = [0] * len(series)
+        if self.resample:
+            resampled = []
+            for i, (x, y) in enumerate(series):
+                t1 = time.perf_counter_ns()
+                resampled.append(
+                    self.resample_series(x=np.asarray(x), y=np.asarray(y))
+                )
+                resampleTimes[i] = time.perf_counter_ns() - t1
+            series = resampled
+
+        # Group the extractions by Time series
+        groups = collections.OrderedDict()
+        for i, (x, y) in enumerate(series):
+            x = np.asarray(x, dtype=float)
+            key = (x.shape[0], x.tobytes())
+            if key not in groups:
+                groups[key] = (x, [])
+            groups[key][1].append(i)
+
+        # Split each group into chunks of rows, so that a single group of
+        #   extractions of the same duration is spread across the workers
+        tasks = []
+        for x, index in groups.values():
+            size = max(1, int(np.ceil(len(index) / max(workers, 1))))
+            for start in range(0, len(index), size):
+                chunk = index[start:start + size]
+                tasks.append((
+                    x,
+                    np.stack([np.asarray(series[i][1]) for i in chunk]),
+                    chunk
+                ))
+
+        # Solve each chunk
+        solutions = [None] * len(series)
+        if (workers > 1) and (len(tasks) > 1):
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers
+            ) as executor:
+                futures = [
+                    (
+                        index,
+                        executor.submit(
+                            solve_group,
+                            self,
+                            x,
+                            Y,
+                            max_bytes,
+                            [resampleTimes[i] for i in index]
+                        )
+                    )
+                    for x, Y, index in tasks
+                ]
+                for index, future in futures:
+                    for i, solution in zip(index, future.result()):
+                        solutions[i] = solution
         else:
-            scatterXLst = [
-                0,
-                solution['settings']['infusionDuration']
-            ] + self.calculate_quartiles(
-                a=np.array([
-                    solution['settings']['infusionDuration'],
-                    solution['settings']['infusionPressure'],
-                    solution['settings']['p0'],
-                    solution['settings']['p1'],
-                    solution['settings']['p2'],
-                    solution['settings']['p3'],
-                    solution['settings']['p4']
-                ]),
-                xduration=solution['settings']['extractionDuration']
-            ).tolist()
-            scatterYLst = [
-                solution['settings']['infusionPressure'],
-                solution['settings']['infusionPressure'],
-                solution['settings']['p0'],
-                solution['settings']['p1'],
-                solution['settings']['p2'],
-                solution['settings']['p3'],
-                solution['settings']['p4']
-            ]
+            for x, Y, index in tasks:
+                for i, solution in zip(
+                    index,
+                    solve_group(
+                        self,
+                        x,
+                        Y,
+                        max_bytes,
+                        [resampleTimes[i] for i in index]
+                    )
+                ):
+                    solutions[i] = solution
 
-        # Create the plot figure
-        fig = plt.figure()
-        x1 = fig.add_subplot(1, 1, 1)
-        plt.figtext(
-            0.15,
-            0.95,
-            'Run-time: %s' % (
-                str(solution['ppfa']['runTime'])
-            )
-        )
-        plt.figtext(
-            0.15,
-            0.90,
-            'Sq-Root of the Sum of Squared Error: %s' % (
-                round(solution['ppfa']['sse'], 2)
-            )
-        )
+        return solutions
 
-        # Clear, format and plot profile values
-        x1.clear()
-        x1.set_ylabel(
-            'Pressure (bars)'
-        )
-        x1.set_xlabel(
-            'Time (seconds)'
-        )
-        x1.set_xlim(
-            min(solution['settings']['timeLst']),
-            max(solution['settings']['timeLst'])
-        )
-        x1.set_ylim(
-            0,
-            12
-        )
-        x1.tick_params(
-            axis='y',
-            length=0,
-            pad=10
+    def pressure_value(
+        self,
+        p
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        p                       = <float> Knot pressure value (bars)
+
+        Description
+        ---------------------------------------------------------------------
+        Returns {p} as an <int> when it is a whole number of bars, as
+        fitted on the default 1 bar resolution. Otherwise returns {p}
+        rounded to 0.1 bars.
+        """
+
+        if float(p).is_integer():
+            return int(p)
+        else:
+            return float(np.round(p, 1))
+
+    def resample_series(
+        self,
+        x,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the Time and Pressure series linearly interpolated onto a
+        uniform grid of {TIME_INTERVAL}, from the nearest grid time of the
+        first sample to the nearest grid time of the last sample. Series
+        that are already on the grid are returned with the exact grid
+        times.
+        """
+
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.shape[0] < 2:
+            return x, y
+
+        # Order the samples by time
+        if np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind='stable')
+            x = x[order]
+            y = y[order]
+
+        # Derive the uniform grid
+        xgrid = np.round(
+            np.arange(
+                np.round(x[0] / self.TIME_INTERVAL),
+                np.round(x[-1] / self.TIME_INTERVAL) + 1
+            ) * self.TIME_INTERVAL,
+            decimals=6
         )
-        x1.tick_params(
-            axis='x',
-            length=0,
-            pad=10
+
+        # Return series already on the grid
+        if (xgrid.shape[0] == x.shape[0]) and np.all(
+            np.abs(x - xgrid) <= self.TIME_INTERVAL * 1e-6
+        ):
+            return xgrid, y
+
+        # Interpolate onto the grid
+        return xgrid, compiled_interp(
+            x=xgrid,
+            xp=x,
+            fp=y
         )
-        x1.plot(
-            solution['settings']['timeLst'],
-            (
-                solution['settings']['pressureSeries']
-                [:len(solution['settings']['timeLst'])]
-            ),
-            color='blue',
-            alpha=0.25,
-            linewidth=1,
-            label='Observed'
+
+    def time_index(
+        self,
+        x,
+        t
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        t                       = <float> Time (seconds)
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the index of the first time value of {x} at or after {t},
+        within half of {TIME_INTERVAL}.
+        """
+
+        return int(np.searchsorted(x, t - self.TIME_INTERVAL / 2))
+
+    def reduce(
+        self,
+        x,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        START_DELAY             = <int> Period of duration in time (seconds)
+                                    to omit from the expresso extraction
+                                    time-series.
+        INFUSION_DURATION_LIMIT = <int> Maximum period of duration in
+                                    time (seconds) for pre-infusion.
+        INFUSION_LIMIT          = <int> Maximum pressure (bars)
+                                    considered to be pre-infusion.
+
+        Description
+        ---------------------------------------------------------------------
+        Simplifies the espresso extraction time-series, using the
+        Ramer-Douglas-Peucker (RDP) algorithm, to identify local pressure
+        values for the simulation and selection of the best fitted pressure
+        profile.
+        """
+
+        # Apply smoothing
+        ysmoothed = self.smooth(y=y)
+
+        # Determine the first index where pressure exceeds
+        #   the pre-infusion pressure limit
+        INFUSION_DURATION_INDEX = self.infusion_duration_index(
+            ysmoothed=ysmoothed
         )
-        x1.plot(
-            solution['settings']['timeLst'],
-            (
-                solution['settings']['pressureSeriesSmoothed']
-                [:len(solution['settings']['timeLst'])]
-            ),
-            color='blue',
-            alpha=0.5,
-            linewidth=1,
-            label='Smoothed'
+
+        # Return local pressure values
+        return self.reduce_ranges(
+            x=x,
+            ysmoothed=ysmoothed,
+            INFUSION_DURATION_INDEX=INFUSION_DURATION_INDEX
         )
-        x1.plot(
-            solution['settings']['timeLst'],
-            (
-                solution['settings']['pressureProfileLst']
-                [:len(solution['settings']['timeLst'])]
-            ),
-            color='blue',
-            alpha=1,
-            linewidth=1,
-            label='Profile'
+
+    def reduce_many(
+        self,
+        x,
+        Y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+                                    shared by each extraction
+        Y                       = <np.array()> Matrix of the Pressure series
+                                    of shape (extractions, len(x))
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the local pressure values of {reduce} for each row of {Y}.
+        The smoothing and the pre-infusion scan are applied to every row
+        at once.
+        """
+
+        # Apply smoothing
+        Ysmoothed = self.smooth(y=Y)
+
+        # Determine the first index where pressure exceeds
+        #   the pre-infusion pressure limit
+        INFUSION_DURATION_INDEX = self.infusion_duration_index(
+            ysmoothed=Ysmoothed
         )
-        x1.scatter(
-            scatterXLst,
-            scatterYLst,
-            color='red',
-            label='Solution',
-            marker='o',
-            s=25
+
+        # Return local pressure values
+        return [
+            self.reduce_ranges(
+                x=x,
+                ysmoothed=ysmoothed,
+                INFUSION_DURATION_INDEX=index
+            )
+            for ysmoothed, index in zip(Ysmoothed, INFUSION_DURATION_INDEX)
+        ]
+
+    def reduce_batch(
+        self,
+        series
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        series                  = <list> List of (x, y) tuples of the Time
+                                    and Pressure series of each extraction
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the local pressure values of {reduce} for each extraction
+        in {series}. The series may differ in length; they are padded into
+        a single (extractions, samples) matrix so that the smoothing and
+        the pre-infusion scan run once over the whole batch, with a mask
+        of the valid samples of each row.
+        """
+
+        # Pad the Pressure series
+        Y, lengths = self.pad_series(y=[y for x, y in series])
+
+        # Apply smoothing
+        Ysmoothed = self.smooth(y=Y)
+
+        # Determine the first index where pressure exceeds
+        #   the pre-infusion pressure limit
+        INFUSION_DURATION_INDEX = self.infusion_duration_index(
+            ysmoothed=Ysmoothed,
+            lengths=lengths
         )
-        x1.set_xticks(
-            ticks=np.arange(
-                min(solution['settings']['timeLst']),
-                np.ceil(max(solution['settings']['timeLst'])),
-                1
+
+        # Return local pressure values
+        return [
+            self.reduce_ranges(
+                x=np.asarray(x),
+                ysmoothed=ysmoothed[:length],
+                INFUSION_DURATION_INDEX=index
             )
+            for (x, y), ysmoothed, length, index in zip(
+                series,
+                Ysmoothed,
+                lengths,
+                INFUSION_DURATION_INDEX
+            )
+        ]
+
+    def pad_series(
+        self,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        y                       = <list> List of Pressure series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns a matrix of the Pressure series of shape
+        (extractions, samples) and the vector of the length of each series.
+        Each row is padded with the reflection of its own tail, so that
+        smoothing the matrix along its last axis returns the same values
+        as smoothing each series on its own.
+        """
+
+        lengths = np.array([len(a) for a in y], dtype=int)
+        Y = np.zeros(
+            shape=(len(y), np.max(lengths, initial=0) + 3),
+            dtype=float
         )
-        x1.legend(loc='upper right')
 
-        # Save
-        plt.savefig(
-            os.path.join(
-                dirName,
-                '.'.join([
-                    '_'.join([
-                        fileName,
-                        str(solution['ppfa']['simulations']),
-                        str(solution['ppfa']['id'])
-                    ]),
-                    'jpeg'
-                ])
+        # Fill and reflect each series
+        for i, a in enumerate(y):
+            Y[i, :lengths[i]] = a
+            Y[i, lengths[i]:lengths[i] + 3] = np.pad(
+                np.asarray(a, dtype=float),
+                pad_width=(0, 3),
+                mode='symmetric'
+            )[lengths[i]:]
+
+        return Y, lengths
+
+    def decimate(
+        self,
+        x,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the Time and Pressure series decimated to at most
+        {max_points} values by the {decimation} method, and the
+        decimation factor, the number of samples per block. The last sample
+        is kept, so that the knot times of the pressure profiles, which
+        follow from the last time value, are unchanged. The 'lttb' method
+        also keeps the first sample, whereas the 'mean' method replaces it
+        by the mean of its block. Series within {max_points} are returned
+        as is with a factor of {1}.
+        """
+
+        if (self.max_points is None) or (x.shape[0] <= self.max_points):
+            return x, y, 1
+
+        # Replace each block by its mean
+        if self.decimation == 'mean':
+            factor = int(np.ceil((x.shape[0] - 1) / (self.max_points - 1)))
+            starts = np.arange(0, x.shape[0] - 1, factor)
+            counts = np.diff(np.append(starts, x.shape[0] - 1))
+            return (
+                np.append(np.add.reduceat(x[:-1], starts) / counts, x[-1]),
+                np.append(np.add.reduceat(y[:-1], starts) / counts, y[-1]),
+                factor
+            )
+
+        # Keep the sample of each block with the largest triangle
+        #   formed with the last kept sample and the mean of the next block
+        else:
+            factor = int(np.ceil((x.shape[0] - 2) / (self.max_points - 2)))
+            starts = np.arange(1, x.shape[0] - 1, factor)
+            stops = np.append(starts[1:], x.shape[0] - 1)
+            xmeans = np.append(
+                np.add.reduceat(x[1:-1], starts - 1) / (stops - starts),
+                x[-1]
+            )
+            ymeans = np.append(
+                np.add.reduceat(y[1:-1], starts - 1) / (stops - starts),
+                y[-1]
+            )
+            index = np.empty(starts.shape[0] + 2, dtype=int)
+            index[0] = 0
+            index[-1] = x.shape[0] - 1
+            for i, (start, stop) in enumerate(zip(starts, stops)):
+                a = index[i]
+                area = np.abs(
+                    (x[a] - xmeans[i + 1]) * (y[start:stop] - y[a]) -
+                    (x[a] - x[start:stop]) * (ymeans[i + 1] - y[a])
+                )
+                index[i + 1] = start + np.argmax(area)
+            return x[index], y[index], factor
+
+    def smooth(
+        self,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        y                       = <np.array()> Vector of the Pressure series,
+                                    or matrix of the Pressure series of
+                                    shape (extractions, samples)
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the moving average of {y} along its last axis.
+        """
+
+        return np.array(
+            scipy.ndimage.uniform_filter1d(
+                y,
+                size=7,
+                axis=-1,
+                mode='reflect'
             )
         )
-        plt.close('all')
+
+    def infusion_duration_index(
+        self,
+        ysmoothed,
+        lengths=None
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        ysmoothed               = <np.array()> Vector of the smoothed
+                                    Pressure series, or matrix of the
+                                    smoothed Pressure series of shape
+                                    (extractions, samples)
+        lengths                 = <np.array()> Optional vector of the number
+                                    of valid samples in each row of
+                                    {ysmoothed}
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the end of pre-infusion detected by {detector} after
+        {START_DELAY}, the first index where the smoothed pressure exceeds
+        the pre-infusion pressure limit, along the last axis of
+        {ysmoothed}. Series without pre-infusion return the index of
+        {START_DELAY}. Samples beyond {lengths} are ignored.
+        """
+
+        index = self.detector.scan(
+            ysmoothed=ysmoothed,
+            lengths=lengths
+        )
+
+        return np.where(index < 0, self.detector.start, index)
+
+    def reduce_ranges(
+        self,
+        x,
+        ysmoothed,
+        INFUSION_DURATION_INDEX
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        ysmoothed               = <np.array()> Vector of the smoothed
+                                    Pressure series
+        INFUSION_DURATION_INDEX = <int> First index where the smoothed
+                                    pressure exceeds the pre-infusion
+                                    pressure limit
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the possible pre-infusion durations and the local pressure
+        values of pre-infusion and of each extraction quintile.
+        """
+
+        # Evaluate pre-infusion
+        if (
+            (
+                ysmoothed.shape[0] >= np.round(
+                    (
+                        self.EXTRACTION_DURATION_MIN *
+                        self.TIME_INTERVAL_CONVERSION
+                    ),
+                    decimals=0
+                )
+            ) and
+            (
+                INFUSION_DURATION_INDEX > np.round(
+                    self.START_DELAY * self.TIME_INTERVAL_CONVERSION,
+                    decimals=0
+                )
+            )
+        ):
+
+            # Derive pre-infusion duration values
+            xti = self.reduce_range(
+                a=x[
+                    np.round(
+                        (
+                            INFUSION_DURATION_INDEX -
+                            self.TIME_INTERVAL_CONVERSION
+                        ),
+                        decimals=0
+                    ):INFUSION_DURATION_INDEX
+                ]
+            )
+
+            # Derive local extraction pressure values
+            ypi = self.reduce_range(
+                a=ysmoothed[:self.time_index(x=x, t=xti[-1])]
+            )
+            yp0, yp1, yp2, yp3, yp4 = (
+                self.derive_local_extraction_pressure_ranges(
+                    x=x,
+                    y=ysmoothed,
+                    xti=xti
+                )
+            )
+            yp0 = self.reduce_range(a=yp0)
+            yp1 = self.reduce_range(a=yp1)
+            yp2 = self.reduce_range(a=yp2)
+            yp3 = self.reduce_range(a=yp3)
+            yp4 = self.reduce_range(a=yp4)
+
+        else:
+
+            # Derive pre-infusion duration values
+            xti = np.array([0])
+
+            # Derive local extraction pressure values
+            ypi = np.array([])
+            yp0, yp1, yp2, yp3, yp4 = (
+                self.derive_local_extraction_pressure_ranges(
+                    x=x,
+                    y=ysmoothed,
+                    xti=xti
+                )
+            )
+            yp0 = self.reduce_range(a=yp0)
+            yp1 = self.reduce_range(a=yp1)
+            yp2 = self.reduce_range(a=yp2)
+            yp3 = self.reduce_range(a=yp3)
+            yp4 = self.reduce_range(a=yp4)
+
+        # Return local pressure values
+        return xti, ypi, yp0, yp1, yp2, yp3, yp4, ysmoothed
+
+    def derive_local_extraction_pressure_ranges(
+        self,
+        x,
+        y,
+        xti
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        xti                     = <np.array()> Vector of possible pre-infusion
+                                    duration values (seconds)
+
+        Description
+        ---------------------------------------------------------------------
+        Returns a range of unique intager values from {a}.
+        """
+
+        return np.array_split(
+            ary=y[self.time_index(x=x, t=xti[-1]):],
+            indices_or_sections=5
+        )
+
+    def reduce_range(
+        self,
+        a
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        a                       = <np.array()> Vector
+
+        Description
+        ---------------------------------------------------------------------
+        Returns a range of unique intager values from {a}.
+        """
+
+        return np.arange(
+            start=np.floor(np.max(np.array([np.min(a), 1]))),
+            stop=np.round(
+                np.ceil(np.max(a) + 1),
+                decimals=0
+            ),
+            step=1
+        )
+
+    def simulate_profiles(
+        self,
+        x,
+        xti,
+        ypi,
+        yp0,
+        yp1,
+        yp2,
+        yp3,
+        yp4,
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        xti                     = <np.array()> Vector of possible pre-infusion
+                                    duration values (seconds)
+        ypi                     = <np.array()> Vector of possible pre-infusion
+                                    pressure values (bars)
+        yp0                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 1st quartile
+        yp1                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 2nd quartile
+        yp2                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 3rd quartile
+        yp3                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 4th quartile
+        yp4                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 5th quartile
+
+        Description
+        ---------------------------------------------------------------------
+        Simulates espresso extraction profiles. Returns the simulated
+        profiles and the candidate space that decodes the parameters of
+        each simulated profile from its id.
+        """
+
+        # Index the possible espresso extraction parameters
+        profiles = CandidateSpace(
+            xti=xti,
+            ypi=ypi,
+            yp0=yp0,
+            yp1=yp1,
+            yp2=yp2,
+            yp3=yp3,
+            yp4=yp4
+        )
+
+        # Simulate pre-infusion or extraction pressure profiles
+        maty0 = self.render_profiles(
+            a=profiles.decode(index=np.arange(profiles.size)),
+            x=x
+        )
+
+        return maty0, profiles
+
+    def simulate_parameters(
+        self,
+        xti,
+        ypi,
+        yp0,
+        yp1,
+        yp2,
+        yp3,
+        yp4,
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        xti                     = <np.array()> Vector of possible pre-infusion
+                                    duration values (seconds)
+        ypi                     = <np.array()> Vector of possible pre-infusion
+                                    pressure values (bars)
+        yp0                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 1st quartile
+        yp1                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 2nd quartile
+        yp2                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 3rd quartile
+        yp3                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 4th quartile
+        yp4                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 5th quartile
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the Cartesian product of the possible espresso extraction
+        parameters. With pre-infusion the array has shape (n, 7).
+        Otherwise shape (n, 5).
+        """
+
+        # Simulate pre-infusion pressure profile parameters
+        if ypi.shape[0] > 0:
+            return np.array(
+                np.meshgrid(
+                    xti,
+                    ypi,
+                    yp0,
+                    yp1,
+                    yp2,
+                    yp3,
+                    yp4
+                )
+            ).transpose().reshape(-1, 7)
+
+        # Simulate extraction pressure profile parameters
+        else:
+            return np.array(
+                np.meshgrid(
+                    yp0,
+                    yp1,
+                    yp2,
+                    yp3,
+                    yp4
+                )
+            ).transpose().reshape(-1, 5)
+
+    def interpolate(
+        self,
+        a,
+        x
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        a                       = <np.array()> Simulated espresso extraction
+                                    parameters in the following order,
+                                    {inf. dur}, {inf. pres}, {p0}, {p1}, {p2},
+                                    {p3}, {p4}. With pre-infusion {a} has
+                                    shape (7, ). Otherwise shape (5, ).
+        x                       = <np.array()> Vector of the Time series
+
+        Description
+        ---------------------------------------------------------------------
+        Derives a possible extraction profile as a linear interpolation.
+        """
+
+        # Generate the x and y coordinates for a pre-infusion pressure profile
+        #   xp = np.array([
+        #       0,
+        #       {inf. dur},
+        #       {t0},
+        #       {t1},
+        #       {t2},
+        #       {t3},
+        #       {t4}
+        #   ])
+        #   fp = np.array([
+        #       {inf. pres},
+        #       {inf. pres},
+        #       {p0},
+        #       {p1},
+        #       {p2},
+        #       {p3},
+        #       {p4}
+        #   ])
+        if a.shape[0] > 5:
+            xp = self.knot_times(
+                a=a,
+                xduration=x[-1]
+            )
+            fp = np.concatenate(
+                (
+                    np.array([a[1], a[1]]),
+                    a[2:]
+                ),
+                axis=None
+            )
+
+        # Generate the x and y coordinates for an extraction pressure profile
+        #   xp = np.array([
+        #       {t0},
+        #       {t1},
+        #       {t2},
+        #       {t3},
+        #       {t4}
+        #   ])
+        #   fp = np.array([
+        #       {p0},
+        #       {p1},
+        #       {p2},
+        #       {p3},
+        #       {p4}
+        #   ])
+        else:
+            xp = self.knot_times(
+                a=a,
+                xduration=x[-1]
+            )
+            fp = np.copy(a)
+
+        # Derive a possible pressure profile as a linear interpolation
+        return compiled_interp(
+            x=x,
+            xp=xp,
+            fp=fp
+        )
+
+    def render_profiles(
+        self,
+        a,
+        x
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        a                       = <np.array()> Simulated espresso extraction
+                                    parameters of shape (n, 7) with
+                                    pre-infusion. Otherwise shape (n, 5).
+        x                       = <np.array()> Vector of the Time series
+
+        Description
+        ---------------------------------------------------------------------
+        Derives the possible extraction profiles of every row of {a} as
+        a linear interpolation. Equivalent to applying {interpolate} to
+        each row, but the knot times are derived once per pre-infusion
+        duration and the profiles are interpolated by broadcasting.
+        """
+
+        maty0 = np.empty((a.shape[0], x.shape[0]))
+
+        # Group the simulations by pre-infusion duration
+        if a.shape[1] > 5:
+            durations = np.unique(a[:, 0])
+        else:
+            durations = np.array([0])
+
+        for infusionDuration in durations:
+
+            # Generate the x and y coordinates of the pressure profiles
+            if a.shape[1] > 5:
+                rows = np.flatnonzero(a[:, 0] == infusionDuration)
+                xp = self.basis(x=x, infusionDuration=infusionDuration)[0]
+                fp = np.concatenate(
+                    (
+                        a[rows, 1:2],
+                        a[rows, 1:]
+                    ),
+                    axis=1
+                )
+            else:
+                rows = slice(None)
+                xp = self.basis(x=x, infusionDuration=infusionDuration)[0]
+                fp = a
+
+            # Locate the knot interval of each time value
+            j = np.searchsorted(xp, x, side='right') - 1
+            jc = np.clip(j, 0, xp.shape[0] - 1)
+            ji = np.clip(j, 0, xp.shape[0] - 2)
+
+            # Interpolate within the knot intervals, matching the
+            #   compiled interpolation, which returns the knot value on
+            #   and beyond the knots
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope = (fp[:, ji + 1] - fp[:, ji]) / (xp[ji + 1] - xp[ji])
+                maty0[rows] = np.where(
+                    (j >= 0) & (j < xp.shape[0] - 1) & (xp[jc] != x),
+                    slope * (x - xp[ji]) + fp[:, ji],
+                    fp[:, jc]
+                )
+
+        return maty0
+
+    def calculate_quartiles(
+        self,
+        a,
+        xduration,
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        a                       = <np.array()> Simulated espresso extraction
+                                    parameters in the following order,
+                                    {inf. dur}, {inf. pres}, {p0}, {p1}, {p2},
+                                    {p3}, {p4}. With pre-infusion {a} has
+                                    shape (7, ). Otherwise shape (5, ).
+        xduration               = <float> The value of the duration of the
+                                    time series
+
+        Description
+        ---------------------------------------------------------------------
+        Calculates the quartiles of the espresso extraction time series
+        for linear interpolation.
+        """
+
+        # Derive the start time from the simulated espresso extraction
+        #   parameters
+        if a.shape[0] > 5:
+            x0 = np.round(a[0] + 1, decimals=0)
+        else:
+            x0 = 0
+
+        # Return the x coordinates of the espresso extraction quartiles
+        return np.quantile(
+            np.arange(
+                start=x0,
+                stop=np.round(
+                    xduration + 0.1,
+                    decimals=1
+                ),
+                step=0.1
+            ),
+            q=np.array([0, 0.25, 0.5, 0.75, 1]),
+            axis=0
+        )
+
+    def knot_times(
+        self,
+        a,
+        xduration
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        a                       = <np.array()> Simulated espresso extraction
+                                    parameters in the following order,
+                                    {inf. dur}, {inf. pres}, {p0}, {p1}, {p2},
+                                    {p3}, {p4}. With pre-infusion {a} has
+                                    shape (7, ). Otherwise shape (5, ).
+        xduration               = <float> The value of the duration of the
+                                    time series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the x coordinates of the pressure profile knots. With
+        pre-infusion the knots are {0}, {inf. dur}, {t0}, {t1}, {t2}, {t3},
+        {t4}. Otherwise the knots are {t0}, {t1}, {t2}, {t3}, {t4}.
+        """
+
+        if a.shape[0] > 5:
+            return np.concatenate(
+                (
+                    np.array([0, a[0]]),
+                    np.array(self.calculate_quartiles(
+                            a=a,
+                            xduration=xduration
+                        )
+                    )
+                )
+            )
+        else:
+            return self.calculate_quartiles(
+                a=a,
+                xduration=xduration
+            )
+
+    def hat_basis(
+        self,
+        x,
+        xp
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        xp                      = <np.array()> Vector of the pressure profile
+                                    knot times
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the sparse hat-basis of the linear interpolation of {x}
+        on {xp} as a vector of the knot interval of each time value and a
+        vector of the weight of the right knot of that interval. Time values
+        outside of {xp} are clamped to the first or last knot.
+        """
+
+        # Locate the knot interval of each time value
+        j = np.clip(
+            np.searchsorted(xp, x, side='right') - 1,
+            0,
+            xp.shape[0] - 2
+        )
+
+        # Derive the weight of the right knot of each interval
+        with np.errstate(divide='ignore', invalid='ignore'):
+            w = np.clip(
+                np.nan_to_num(
+                    (x - xp[j]) / (xp[j + 1] - xp[j]),
+                    nan=1
+                ),
+                0,
+                1
+            )
+
+        return j, w
+
+    def basis(
+        self,
+        x,
+        infusionDuration
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        infusionDuration        = <float> Pre-infusion duration (seconds),
+                                    {0} without pre-infusion
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the knot times and the sparse hat-basis of the pressure
+        profiles with the pre-infusion duration {infusionDuration}. The
+        basis is held in {BASIS_CACHE}, keyed on a digest of every time
+        value of {x}, the time interval and {infusionDuration}, so repeated
+        solves of extractions with the same time values skip its
+        construction, and irregular series never share a basis.
+        """
+
+        # Return the cached basis of the same time series
+        key = (
+            hashlib.sha1(x.tobytes()).hexdigest(),
+            x.dtype.str,
+            self.TIME_INTERVAL,
+            float(infusionDuration)
+        )
+        cached = BASIS_CACHE.get(key=key)
+        if cached is not None:
+            return cached
+
+        # Construct the basis
+        if infusionDuration > 0:
+            a = np.array([infusionDuration, 0, 0, 0, 0, 0, 0])
+        else:
+            a = np.zeros(5)
+        xp = self.knot_times(a=a, xduration=x[-1])
+        j, w = self.hat_basis(x=x, xp=xp)
+        for array in (xp, j, w):
+            array.setflags(write=False)
+
+        BASIS_CACHE.put(key=key, value=(xp, j, w))
+
+        return xp, j, w
+
+    def basis_matrix(
+        self,
+        x,
+        infusionDuration
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        infusionDuration        = <float> Pre-infusion duration (seconds),
+                                    {0} without pre-infusion
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the dense hat-basis {B} of the pressure profiles with the
+        pre-infusion duration {infusionDuration}, such that the pressure
+        profile of the knot pressure values {p} is {Bp}. With pre-infusion
+        the first two knots share the pre-infusion pressure, so {p} is
+        {inf. pres}, {p0}, {p1}, {p2}, {p3}, {p4}. Otherwise {p} is {p0},
+        {p1}, {p2}, {p3}, {p4}.
+        """
+
+        # Construct the dense hat-basis
+        xp, j, w = self.basis(x=x, infusionDuration=infusionDuration)
+        B = np.zeros((x.shape[0], xp.shape[0]))
+        B[np.arange(x.shape[0]), j] = 1 - w
+        B[np.arange(x.shape[0]), j + 1] += w
+
+        # Merge the pre-infusion knots
+        if infusionDuration > 0:
+            B = np.concatenate(
+                (
+                    B[:, :1] + B[:, 1:2],
+                    B[:, 2:]
+                ),
+                axis=1
+            )
+
+        return B
+
+    def gram(
+        self,
+        x,
+        y,
+        infusionDuration
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        infusionDuration        = <float> Pre-infusion duration (seconds),
+                                    {0} without pre-infusion
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the Gram matrix {G}, the vector {b} and the scalar {yy} of
+        the hat-basis {B} of the pressure profiles with the pre-infusion
+        duration {infusionDuration}, such that the squared error of the
+        knot pressure values {p} is,
+            ||Bp - y||^2 = p'Gp - 2p'b + yy
+        The knot pressure values {p} are ordered as in {basis_matrix}.
+        """
+
+        B = self.basis_matrix(x=x, infusionDuration=infusionDuration)
+
+        return B.T @ B, B.T @ y, float(y @ y)
+
+    def segment_statistics(
+        self,
+        y,
+        j,
+        w,
+        intervals
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        y                       = <np.array()> Vector of the Pressure series
+        j                       = <np.array()> Vector of the knot interval of
+                                    each time value
+        w                       = <np.array()> Vector of the weight of the
+                                    right knot of each time value
+        intervals               = <int> Number of knot intervals
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the sufficient statistics of the squared error of each
+        knot interval as an array of shape ({intervals}, 6) with the columns,
+        sum((1-w)^2), sum((1-w)w), sum(w^2), sum((1-w)y), sum(wy),
+        sum(y^2). For left and right knot values {a} and {b} the squared
+        error of the interval is,
+            s0 a^2 + 2 s1 ab + s2 b^2 - 2 s3 a - 2 s4 b + s5
+        """
+
+        v = 1 - w
+
+        return np.stack(
+            [
+                np.bincount(j, weights=weights, minlength=intervals)
+                for weights in (v * v, v * w, w * w, v * y, w * y, y * y)
+            ],
+            axis=1
+        )
+
+    def knot_statistics(
+        self,
+        x,
+        y,
+        infusionDuration
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        infusionDuration        = <float> Pre-infusion duration (seconds),
+                                    {0} without pre-infusion
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the sufficient statistics of {segment_statistics} of each
+        knot interval of the pressure profiles with the pre-infusion
+        duration {infusionDuration}.
+        """
+
+        xp, j, w = self.basis(x=x, infusionDuration=infusionDuration)
+
+        return self.segment_statistics(
+            y=y,
+            j=j,
+            w=w,
+            intervals=xp.shape[0] - 1
+        )
+
+    def prefix_sums(
+        self,
+        x,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the prefix sums of x, x^2, y, xy and y^2 as an array of
+        shape (len(x) + 1, 5), with the empty prefix in the first row.
+        """
+
+        sums = np.zeros((x.shape[0] + 1, 5))
+        np.cumsum(
+            np.stack([x, x * x, y, x * y, y * y], axis=1),
+            axis=0,
+            out=sums[1:]
+        )
+
+        return sums
+
+    def interval_statistics(
+        self,
+        sums,
+        lo,
+        hi,
+        xa,
+        xb
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        sums                    = <np.array()> Prefix sums of {prefix_sums}
+        lo                      = <np.array()> Index of the first time value
+                                    of each interval
+        hi                      = <np.array()> Index after the last time
+                                    value of each interval
+        xa                      = <np.array()> Time of the left knot of each
+                                    interval
+        xb                      = <np.array()> Time of the right knot of each
+                                    interval
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the sufficient statistics of {segment_statistics} of each
+        interval from the prefix sums, with the statistics on the last
+        axis. The arguments are broadcast against each other. With the
+        interval width {h} the weight of the right knot is
+        w = (x - xa) / h, so each statistic is a polynomial of the sums of
+        1, x, x^2, y, xy and y^2 over the interval.
+        """
+
+        n = (hi - lo).astype(float)
+        sx, sxx, sy, sxy, syy = np.moveaxis(sums[hi] - sums[lo], -1, 0)
+        h = xb - xa
+        h = np.where(h > 0, h, 1)
+
+        return np.stack(
+            np.broadcast_arrays(
+                (n * xb * xb - 2 * xb * sx + sxx) / (h * h),
+                (-sxx + (xa + xb) * sx - n * xa * xb) / (h * h),
+                (sxx - 2 * xa * sx + n * xa * xa) / (h * h),
+                (xb * sy - sxy) / h,
+                (sxy - xa * sy) / h,
+                syy
+            ),
+            axis=-1
+        )
+
+    def segment_costs(
+        self,
+        s,
+        a,
+        b
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        s                       = <np.array()> Sufficient statistics of the
+                                    squared error of a knot interval
+        a                       = <np.array()> Vector of possible left knot
+                                    pressure values (bars)
+        b                       = <np.array()> Vector of possible right knot
+                                    pressure values (bars)
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the squared error of the knot interval for every
+        combination of {a} and {b} as an array of shape (len(a), len(b)).
+        """
+
+        a = a[:, None]
+        b = b[None, :]
+
+        return (
+            s[0] * a * a + 2 * s[1] * a * b + s[2] * b * b -
+            2 * s[3] * a - 2 * s[4] * b + s[5]
+        )
+
+    def chain_costs(
+        self,
+        x,
+        y,
+        infusionDuration,
+        axes
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        infusionDuration        = <float> Pre-infusion duration (seconds),
+                                    {0} without pre-infusion
+        axes                    = <list> List of the vectors of possible knot
+                                    pressure values, {ypi}, {yp0}, {yp1},
+                                    {yp2}, {yp3}, {yp4} with pre-infusion.
+                                    Otherwise {yp0}, {yp1}, {yp2}, {yp3},
+                                    {yp4}.
+
+        Description
+        ---------------------------------------------------------------------
+        Decomposes the squared error of a pressure profile into the chain
+        of neighbouring knots. Returns the vector of the squared error
+        that depends on the first knot alone and the list of the squared
+        error tables of each pair of neighbouring knots.
+        """
+
+        # Derive the knot interval statistics
+        s = self.knot_statistics(
+            x=x,
+            y=y,
+            infusionDuration=infusionDuration
+        )
+
+        # The pre-infusion interval holds the first knot constant
+        if infusionDuration > 0:
+            unary = np.diagonal(
+                self.segment_costs(s=s[0], a=axes[0], b=axes[0])
+            ).copy()
+            s = s[1:]
+        else:
+            unary = np.zeros(axes[0].shape[0])
+
+        return unary, [
+            self.segment_costs(s=s[k], a=axes[k], b=axes[k + 1])
+            for k in range(len(axes) - 1)
+        ]
+
+    def fit_profile(
+        self,
+        maty0,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        maty0                   = <np.array()> Simulated espresso extraction
+                                    profiles
+        y                       = <np.array()> Pressure series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated pressure profile with the minimal
+        square root of the sum of absolute squared error with the
+        pressure series.
+        """
+
+        # Calculate the frobenius norm of the error
+        sse = np.linalg.norm(maty0-y, axis=1)
+
+        return self.select_profile(sse=sse)
+
+    def score_profiles(
+        self,
+        x,
+        y,
+        a
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        a                       = <np.array()> Simulated espresso extraction
+                                    parameters of shape (n, 7) with
+                                    pre-infusion. Otherwise shape (n, 5).
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the square root of the sum of squared error of each
+        simulated pressure profile with the pressure series. The error is
+        evaluated from the Gram matrix of the hat-basis of each
+        pre-infusion duration, so memory depends on the number of
+        simulations and knots rather than on the number of simulations and
+        time values.
+        """
+
+        sse = np.empty(a.shape[0])
+
+        # Group the simulations by pre-infusion duration
+        if a.shape[1] > 5:
+            durations = np.unique(a[:, 0])
+        else:
+            durations = np.array([0])
+
+        for infusionDuration in durations:
+            if a.shape[1] > 5:
+                mask = a[:, 0] == infusionDuration
+                p = a[mask, 1:]
+            else:
+                mask = slice(None)
+                p = a
+
+            # Evaluate p'Gp - 2p'b + yy
+            G, b, yy = self.gram(
+                x=x,
+                y=y,
+                infusionDuration=infusionDuration
+            )
+            sse[mask] = (
+                np.einsum('ij,jk,ik->i', p, G, p) -
+                2 * np.einsum('ij,j->i', p, b) +
+                yy
+            )
+
+        return np.sqrt(np.maximum(sse, 0))
+
+    def select_profile(
+        self,
+        sse
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        sse                     = <np.array()> Vector of the square root of
+                                    the sum of squared error of each
+                                    simulated pressure profile
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated pressure profile with the minimal
+        square root of the sum of absolute squared error.
+        """
+
+        return self.summarize_candidates(
+            candidates=self.top_candidates(
+                sse=sse,
+                index=np.arange(sse.shape[0])
+            ),
+            simulations=sse.shape[0]
+        )
+
+    def top_candidates(
+        self,
+        sse,
+        index,
+        candidates=None
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        sse                     = <np.array()> Vector of the square root of
+                                    the sum of squared error of each
+                                    simulated pressure profile
+        index                   = <np.array()> Vector of the simulation id
+                                    of each value of {sse}
+        candidates              = <list> Optional running list of the best
+                                    simulations as (sse, id) tuples
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the {top_k} simulations with the minimal error among {sse}
+        and {candidates} as a list of (sse, id) tuples, ordered by error
+        and then by id. The simulations of {sse} are selected by partition
+        rather than by sorting, so the running list can be maintained in a
+        single pass over chunks of simulations.
+        """
+
+        # Select the simulations within the {top_k} minimal errors
+        k = int(np.min([self.top_k, sse.shape[0]]))
+        keep = np.flatnonzero(sse <= np.partition(sse, k - 1)[k - 1])
+        keep = keep[np.lexsort((index[keep], sse[keep]))[:k]]
+
+        # Merge with the running list
+        return heapq.nsmallest(
+            self.top_k,
+            (candidates or []) + [
+                (float(sse[i]), int(index[i])) for i in keep
+            ]
+        )
+
+    def summarize_candidates(
+        self,
+        candidates,
+        simulations
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        candidates              = <list> List of the best simulations as
+                                    (sse, id) tuples, ordered by error
+        simulations             = <int> Number of simulations scored
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the fitted solution of the best simulation. With {top_k}
+        greater than 1 the solution also reports the best simulations and
+        the margin of victory, the difference between the error of the
+        second best and the best simulation, in absolute terms and
+        relative to the error of the second best simulation.
+        """
+
+        solution = {
+            'id': int(candidates[0][1]),
+            'sse': float(np.round(candidates[0][0], 6)),
+            'simulations': int(simulations)
+        }
+
+        if self.top_k > 1:
+            solution['topK'] = [
+                {
+                    'id': int(id),
+                    'sse': float(np.round(sse, 6))
+                } for sse, id in candidates
+            ]
+            if len(candidates) > 1:
+                margin = candidates[1][0] - candidates[0][0]
+                solution['margin'] = float(np.round(margin, 6))
+                solution['relativeMargin'] = float(np.round(
+                    margin / candidates[1][0] if candidates[1][0] > 0 else 0,
+                    6
+                ))
+
+        return solution
+
+    def solve_dp(
+        self,
+        x,
+        y,
+        space
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated espresso extraction parameters with the
+        minimal square root of the sum of squared error with the pressure
+        series, and the fitted solution. The squared error of a pressure
+        profile is the sum of the squared error of each knot interval, so
+        the best knot values for each pre-infusion duration are determined
+        by dynamic programming over the chain of knots rather than by
+        simulating the Cartesian product of the candidate values.
+        """
+
+        # Initialize the candidate knot values
+        axes, durations = space.knot_axes()
+
+        # Determine the best knot values for each pre-infusion duration
+        best = None
+        for infusionDuration in durations:
+            unary, pairs = self.chain_costs(
+                x=x,
+                y=y,
+                infusionDuration=infusionDuration,
+                axes=axes
+            )
+
+            # Forward pass
+            cost = unary
+            backpointers = []
+            for table in pairs:
+                total = cost[:, None] + table
+                backpointers.append(np.argmin(total, axis=0))
+                cost = total[backpointers[-1], np.arange(table.shape[1])]
+
+            # Backward pass
+            digits = [int(np.argmin(cost))]
+            for backpointer in reversed(backpointers):
+                digits.insert(0, int(backpointer[digits[0]]))
+
+            if (best is None) or (cost[digits[-1]] < best[0]):
+                best = (cost[digits[-1]], infusionDuration, digits)
+
+        sse, infusionDuration, digits = best
+
+        # Derive the simulated espresso extraction parameters
+        values = [axis[digit] for axis, digit in zip(axes, digits)]
+        if space.ncols > 5:
+            profile = np.array([infusionDuration] + values)
+        else:
+            profile = np.array(values)
+
+        return profile, {
+            'id': int(space.encode(a=profile[None, :])[0]),
+            'sse': float(np.round(np.sqrt(np.max([sse, 0])), 6)),
+            'simulations': int(space.size),
+            'solver': 'dp'
+        }
+
+    def solve_freeknot(
+        self,
+        x,
+        y,
+        space
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the espresso extraction parameters with the minimal square
+        root of the sum of squared error with the pressure series, and the
+        fitted solution, where the times of the knots {p1}, {p2} and {p3}
+        are free rather than at the quartiles of the extraction. The knots
+        {p0} and {p4} remain at the start and the end of the extraction,
+        and every knot takes the possible pressure values of any
+        extraction quintile.
+
+        The knot times are multiples of {knot_interval} and the quartiles
+        of the extraction, so that every pre-infusion duration that leaves
+        room for the quartiles is feasible. Pre-infusion durations without
+        three distinct knot times are skipped, and without any feasible
+        pre-infusion duration the solution of {solve_dp} at the quartiles
+        is returned. The squared error
+        of a linear segment between any two knot times and pressure values
+        is evaluated in constant time from the prefix sums of the series,
+        so the knot times and pressure values are selected by dynamic
+        programming over the chain of knots, at a cost of the square of
+        the number of possible knot times and pressure values for each
+        knot. The solution reports the knot times and pressure values.
+        """
+
+        # Initialize the candidate knot values
+        axes, durations = space.knot_axes()
+        values = np.unique(np.concatenate(axes[-5:]))
+        sums = self.prefix_sums(x=x, y=y)
+        evaluated = 0
+
+        # Determine the best knots for each pre-infusion duration
+        best = None
+        for infusionDuration in durations:
+            if space.ncols > 5:
+                a = np.array([infusionDuration, 0, 0, 0, 0, 0, 0])
+            else:
+                a = np.zeros(5)
+            xp = self.knot_times(a=a, xduration=x[-1])
+
+            # Derive the possible knot times between the start and the
+            #   end of the extraction, including the quartiles
+            grid = np.round(
+                np.arange(
+                    np.floor(xp[-5] / self.knot_interval) + 1,
+                    np.ceil(xp[-1] / self.knot_interval)
+                ) * self.knot_interval,
+                decimals=6
+            )
+            grid = np.unique(np.concatenate((grid, xp[-4:-1])))
+            grid = grid[(grid > xp[-5]) & (grid < xp[-1])]
+
+            # Skip pre-infusion durations without room for {p1}, {p2}
+            #   and {p3}
+            if grid.shape[0] < 3:
+                continue
+
+            # Chain the knots as (times, pressure values) layers
+            #   With pre-infusion the first knot holds the pre-infusion
+            #   pressure from the start of the series.
+            layers = [
+                (np.array([xp[-5]]), values),
+                (grid, values),
+                (grid, values),
+                (grid, values),
+                (np.array([xp[-1]]), values)
+            ]
+            if space.ncols > 5:
+                layers.insert(0, (np.array([infusionDuration]), axes[0]))
+
+            # Forward pass
+            #   The first knot value is held over the samples before it.
+            times, pressures = layers[0]
+            hold = self.interval_statistics(
+                sums=sums,
+                lo=np.array(0),
+                hi=np.searchsorted(x, times[0]),
+                xa=np.array(0.0),
+                xb=times[0]
+            )
+            cost = self.segment_costs(
+                s=hold,
+                a=pressures,
+                b=pressures
+            ).diagonal()[None, :].copy()
+            backpointers = []
+            for nextTimes, nextPressures in layers[1:]:
+                s = self.interval_statistics(
+                    sums=sums,
+                    lo=np.searchsorted(x, times)[:, None],
+                    hi=np.searchsorted(x, nextTimes)[None, :],
+                    xa=times[:, None],
+                    xb=nextTimes[None, :]
+                )
+                a = pressures[None, :, None, None]
+                b = nextPressures[None, None, None, :]
+                s = s[:, None, :, None, :]
+                total = (
+                    cost[:, :, None, None] +
+                    s[..., 0] * a * a + 2 * s[..., 1] * a * b +
+                    s[..., 2] * b * b - 2 * s[..., 3] * a -
+                    2 * s[..., 4] * b + s[..., 5]
+                )
+
+                # Knot times are strictly increasing
+                total = np.where(
+                    (nextTimes[None, :] > times[:, None])[:, None, :, None],
+                    total,
+                    np.inf
+                ).reshape(
+                    times.shape[0] * pressures.shape[0],
+                    nextTimes.shape[0] * nextPressures.shape[0]
+                )
+                evaluated += total.size
+                backpointers.append(np.argmin(total, axis=0))
+                cost = total[
+                    backpointers[-1],
+                    np.arange(total.shape[1])
+                ].reshape(nextTimes.shape[0], nextPressures.shape[0])
+                times, pressures = nextTimes, nextPressures
+
+            # The last knot value is held over the samples after it
+            hold = self.interval_statistics(
+                sums=sums,
+                lo=np.searchsorted(x, times[0]),
+                hi=np.array(x.shape[0]),
+                xa=times[0],
+                xb=times[0] + 1
+            )
+            cost = cost + self.segment_costs(
+                s=hold,
+                a=pressures,
+                b=pressures
+            ).diagonal()[None, :]
+
+            # Backward pass
+            states = [int(np.argmin(cost))]
+            for backpointer in reversed(backpointers):
+                states.insert(0, int(backpointer[states[0]]))
+
+            if not np.isfinite(cost.flat[states[-1]]):
+                continue
+            if (best is None) or (cost.flat[states[-1]] < best[0]):
+                best = (
+                    cost.flat[states[-1]],
+                    infusionDuration,
+                    [
+                        (
+                            float(layer[0][state // layer[1].shape[0]]),
+                            float(layer[1][state % layer[1].shape[0]])
+                        )
+                        for layer, state in zip(layers, states)
+                    ]
+                )
+
+        # Fall back to the knots at the quartiles
+        if best is None:
+            return self.solve_dp(x=x, y=y, space=space)
+
+        sse, infusionDuration, knots = best
+
+        # Derive the espresso extraction parameters
+        if space.ncols > 5:
+            profile = np.array(
+                [infusionDuration] + [value for time, value in knots]
+            )
+            knots.insert(0, (0.0, knots[0][1]))
+        else:
+            profile = np.array([value for time, value in knots])
+
+        return profile, {
+            'id': None,
+            'sse': float(np.round(np.sqrt(np.max([sse, 0])), 6)),
+            'simulations': int(evaluated),
+            'solver': 'freeknot',
+            'knots': {
+                'times': [round(time, 6) for time, value in knots],
+                'pressures': [value for time, value in knots]
+            }
+        }
+
+    def solve_bnb(
+        self,
+        x,
+        y,
+        space
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated espresso extraction parameters with the
+        minimal square root of the sum of squared error with the pressure
+        series, and the fitted solution. The knots are assigned in order
+        by a depth-first search. A partial profile is pruned when its
+        squared error, plus the minimal error of the next knot interval
+        given its last knot, plus the minimal error of each remaining knot
+        interval, is no better than the best profile so far. The solution
+        reports the number of nodes expanded and pruned.
+        """
+
+        # Initialize the candidate knot values
+        axes, durations = space.knot_axes()
+
+        best = (np.inf, None, None)
+        expanded = 0
+        pruned = 0
+        for infusionDuration in durations:
+            unary, pairs = self.chain_costs(
+                x=x,
+                y=y,
+                infusionDuration=infusionDuration,
+                axes=axes
+            )
+
+            # Derive the lower bounds of the remaining knot intervals
+            rowMins = [table.min(axis=1) for table in pairs] + [0]
+            suffixMins = np.concatenate(
+                (
+                    np.cumsum([table.min() for table in pairs][::-1])[::-1],
+                    np.zeros(2)
+                )
+            )
+
+            # Search the knots depth-first, expanding the children with
+            #   the lowest bound first
+            stack = []
+            cost = unary
+            bound = cost + rowMins[0] + suffixMins[1]
+            for i in np.argsort(bound)[::-1]:
+                stack.append((bound[i], cost[i], [int(i)]))
+            while stack:
+                bound, cost, digits = stack.pop()
+                if bound >= best[0]:
+                    pruned += 1
+                    continue
+                if len(digits) == len(axes):
+                    best = (cost, infusionDuration, digits)
+                    continue
+
+                # Expand the node
+                expanded += 1
+                level = len(digits) - 1
+                cost = cost + pairs[level][digits[-1]]
+                bound = cost + rowMins[level + 1] + suffixMins[level + 2]
+                keep = np.flatnonzero(bound < best[0])
+                pruned += bound.shape[0] - keep.shape[0]
+                for i in keep[np.argsort(bound[keep])[::-1]]:
+                    stack.append((bound[i], cost[i], digits + [int(i)]))
+
+        sse, infusionDuration, digits = best
+
+        # Derive the simulated espresso extraction parameters
+        values = [axis[digit] for axis, digit in zip(axes, digits)]
+        if space.ncols > 5:
+            profile = np.array([infusionDuration] + values)
+        else:
+            profile = np.array(values)
+
+        return profile, {
+            'id': int(space.encode(a=profile[None, :])[0]),
+            'sse': float(np.round(np.sqrt(np.max([sse, 0])), 6)),
+            'simulations': int(space.size),
+            'solver': self.solver,
+            'nodesExpanded': int(expanded),
+            'nodesPruned': int(pruned)
+        }
+
+    def solve_lstsq(
+        self,
+        x,
+        y,
+        space
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated espresso extraction parameters with the
+        minimal square root of the sum of squared error with the pressure
+        series, and the fitted solution. The pressure profile is linear in
+        the knot pressure values, so for each pre-infusion duration the
+        real-valued knot pressure values are fitted by least-squares on the
+        hat-basis. The fit is rounded to the nearest simulation, then the
+        simulations within one position of each knot are scored from the
+        Gram matrix, moving to the best, until no neighbour improves.
+        """
+
+        axes, durations = space.knot_axes()
+
+        candidates = []
+        simulations = 0
+        for infusionDuration in durations:
+
+            # Fit the continuous knot pressure values
+            p = np.linalg.lstsq(
+                self.basis_matrix(x=x, infusionDuration=infusionDuration),
+                y,
+                rcond=None
+            )[0]
+            if space.ncols > 5:
+                p = np.concatenate((np.array([infusionDuration]), p))
+
+            # Search the neighbourhood of the nearest simulation
+            digits = space.nearest(a=p)
+            while True:
+                window = space.window(
+                    lower=np.maximum(digits - 1, 0),
+                    upper=np.minimum(digits + 1, np.array(space.radices) - 1)
+                )
+                a = window.decode(index=np.arange(window.size))
+                index = space.encode(a=a)
+                sse = self.score_profiles(x=x, y=y, a=a)
+                simulations += window.size
+
+                id = np.lexsort((index, sse))[0]
+                if np.array_equal(space.nearest(a=a[id]), digits):
+                    break
+                digits = space.nearest(a=a[id])
+            candidates.append((float(sse[id]), int(index[id])))
+
+        sse, id = min(candidates)
+
+        return space.decode(index=np.array([id]))[0], {
+            'id': int(id),
+            'sse': float(np.round(sse, 6)),
+            'simulations': int(simulations),
+            'solver': self.solver
+        }
+
+    def solve_multires(
+        self,
+        x,
+        y,
+        space
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated espresso extraction parameters with the
+        minimal square root of the sum of squared error with the pressure
+        series, and the fitted solution. The candidate space is searched
+        at the first pressure resolution of {resolutions}. Each following
+        resolution then searches a window of half the previous resolution
+        around each knot pressure of the {beam} best profiles so far. The
+        pre-infusion duration of each refined profile is held constant.
+        As with {reduce_range}, knot pressures are at least 1 bar. The
+        refined profiles are not simulations of the candidate space, so the
+        solution has no id.
+        """
+
+        # Re-sample the coarse candidate space at the first resolution
+        axes, durations = space.knot_axes()
+        step = self.resolutions[0]
+        axes = [
+            np.round(np.arange(axis[0], axis[-1] + step / 2, step), 6)
+            for axis in axes
+        ]
+        if space.ncols > 5:
+            space = CandidateSpace(durations, *axes)
+        else:
+            space = CandidateSpace(durations, np.array([]), *axes)
+
+        # Score the coarse candidate space
+        a = space.decode(index=np.arange(space.size))
+        sse = self.score_profiles(x=x, y=y, a=a)
+        simulations = space.size
+        beam = np.lexsort((np.arange(sse.shape[0]), sse))[:self.beam]
+        a, sse = a[beam], sse[beam]
+
+        # Refine the best profiles within shrinking windows
+        for previous, step in zip(self.resolutions[:-1], self.resolutions[1:]):
+            offsets = step * np.arange(
+                -np.floor(previous / (2 * step) + 1e-9),
+                np.floor(previous / (2 * step) + 1e-9) + 1
+            )
+
+            candidates = [a]
+            for profile in a:
+                if space.ncols > 5:
+                    infusionDuration, values = profile[:1], profile[1:]
+                else:
+                    infusionDuration, values = np.array([0]), profile
+                windows = [
+                    np.unique(np.round(np.maximum(value + offsets, 1), 6))
+                    for value in values
+                ]
+                if space.ncols > 5:
+                    local = CandidateSpace(infusionDuration, *windows)
+                else:
+                    local = CandidateSpace(
+                        infusionDuration,
+                        np.array([]),
+                        *windows
+                    )
+                candidates.append(local.decode(index=np.arange(local.size)))
+                simulations += local.size
+
+            # Keep the best unique profiles
+            a = np.unique(np.concatenate(candidates), axis=0)
+            sse = self.score_profiles(x=x, y=y, a=a)
+            beam = np.lexsort((np.arange(sse.shape[0]), sse))[:self.beam]
+            a, sse = a[beam], sse[beam]
+
+        # Derive the size of the equivalent exhaustive candidate space at
+        #   the finest resolution
+        exhaustive = durations.shape[0] if space.ncols > 5 else 1
+        for axis in axes:
+            exhaustive *= int(
+                np.floor((axis[-1] - axis[0]) / self.resolutions[-1] + 1e-9)
+            ) + 1
+
+        return a[0], {
+            'id': None,
+            'sse': float(np.round(sse[0], 6)),
+            'simulations': int(simulations),
+            'solver': self.solver,
+            'resolutions': list(self.resolutions),
+            'exhaustiveSimulations': int(exhaustive)
+        }
+
+    def prior_profile(
+        self,
+        profile
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        profile                 = <dict> Dictionary object of a pressure
+                                    profile config
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the espresso extraction parameters of a pressure profile
+        config, {inf. dur}, {inf. pres}, {p0}, {p1}, {p2}, {p3}, {p4} with
+        pre-infusion. Otherwise {p0}, {p1}, {p2}, {p3}, {p4}.
+        """
+
+        settings = profile['settings']
+        pressures = [
+            settings['p0'],
+            settings['p1'],
+            settings['p2'],
+            settings['p3'],
+            settings['p4']
+        ]
+        if settings['infusionDuration'] > 0:
+            return np.array(
+                [settings['infusionDuration'], settings['infusionPressure']] +
+                pressures,
+                dtype=float
+            )
+        else:
+            return np.array(pressures, dtype=float)
+
+    def prior_center(
+        self,
+        prior,
+        center
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        prior                   = <np.array()> Espresso extraction parameters
+                                    of a prior profile
+        center                  = <np.array()> Espresso extraction parameters
+                                    of the most promising profile
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the espresso extraction parameters of {prior} in the shape
+        of {center}. The pre-infusion parameters missing from {prior} are
+        taken from {center}, and those of {prior} beyond {center} are
+        omitted.
+        """
+
+        prior = np.asarray(prior, dtype=float)
+        if prior.shape[0] == center.shape[0]:
+            return prior
+        elif prior.shape[0] > center.shape[0]:
+            return prior[-center.shape[0]:]
+        else:
+            return np.concatenate((center[:2], prior))
+
+    def center_profile(
+        self,
+        x,
+        ysmoothed,
+        xti,
+        ypi
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        ysmoothed               = <np.array()> Vector of the smoothed
+                                    Pressure series
+        xti                     = <np.array()> Vector of possible pre-infusion
+                                    duration values (seconds)
+        ypi                     = <np.array()> Vector of possible pre-infusion
+                                    pressure values (bars)
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the espresso extraction parameters at the mean of the
+        smoothed pressure series of pre-infusion and of each extraction
+        quintile, the most promising profile of the candidate space.
+        """
+
+        means = [
+            np.mean(a) for a in self.derive_local_extraction_pressure_ranges(
+                x=x,
+                y=ysmoothed,
+                xti=xti
+            )
+        ]
+        if ypi.shape[0] > 0:
+            return np.array([
+                xti[-1],
+                np.mean(ysmoothed[:self.time_index(x=x, t=xti[-1])])
+            ] + means)
+        else:
+            return np.array(means)
+
+    def solve_anytime(
+        self,
+        x,
+        y,
+        space,
+        center,
+        deadline,
+        chunkSize=16384
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+        center                  = <np.array()> Espresso extraction parameters
+                                    of the most promising profile
+        deadline                = <float> Value of {time.perf_counter()}
+                                    after which the search stops
+        chunkSize               = <int> Number of simulations per chunk
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the best simulated espresso extraction parameters found
+        before {deadline}, and the fitted solution. The simulations are
+        scored from the Gram matrix in rings of increasing distance from
+        the simulation nearest {center}, so the most promising profiles
+        are scored first. The simulation nearest {center} is always
+        scored. The solution reports whether the search completed and the
+        fraction of the candidate space that was scored.
+        """
+
+        # Locate the simulation nearest the most promising profile
+        centerDigits = space.nearest(a=center)
+        radius = int(np.max(np.maximum(
+            centerDigits,
+            np.array(space.radices) - 1 - centerDigits
+        )))
+
+        # Score each ring of simulations until the deadline
+        candidates = []
+        simulations = 0
+        for r in range(radius + 1):
+            window = space.window(
+                lower=np.maximum(centerDigits - r, 0),
+                upper=np.minimum(
+                    centerDigits + r,
+                    np.array(space.radices) - 1
+                )
+            )
+            for start in range(0, window.size, chunkSize):
+                a = window.decode(
+                    index=np.arange(
+                        start,
+                        np.min([start + chunkSize, window.size])
+                    )
+                )
+                index = space.encode(a=a)
+
+                # Omit the simulations of the inner rings
+                ring = np.max(
+                    np.abs(
+                        space.digits(index=index)[:, space.columns] -
+                        centerDigits
+                    ),
+                    axis=1
+                ) == r
+                a, index = a[ring], index[ring]
+
+                if index.shape[0] > 0:
+                    candidates = self.top_candidates(
+                        sse=self.score_profiles(x=x, y=y, a=a),
+                        index=index,
+                        candidates=candidates
+                    )
+                    simulations += index.shape[0]
+
+                if time.perf_counter() > deadline:
+                    break
+            if time.perf_counter() > deadline:
+                break
+
+        solution = self.summarize_candidates(
+            candidates=candidates,
+            simulations=simulations
+        )
+        solution['solver'] = self.solver
+        solution['complete'] = bool(simulations == space.size)
+        solution['coverage'] = float(np.round(simulations / space.size, 6))
+
+        return space.decode(index=np.array([solution['id']]))[0], solution
+
+    def solve_warm(
+        self,
+        x,
+        y,
+        space,
+        center,
+        deadline=None
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+        center                  = <np.array()> Espresso extraction parameters
+                                    of the prior profile
+        deadline                = <float> Optional value of
+                                    {time.perf_counter()} after which the
+                                    search stops
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the best simulated espresso extraction parameters found by
+        a descent from the simulation nearest {center}, and the fitted
+        solution. Each step scores the simulations within one possible
+        value of the best profile so far on every pressure axis, and every
+        possible pre-infusion duration, and moves to the best of them. The
+        search stops at the first step whose best profile is the profile it
+        started from, a local minimum of the candidate lattice, which is
+        not necessarily the best profile of the candidate space. Use the
+        'dp' solver when the best profile is required. The solution reports
+        whether the search completed, the fraction of the candidate space
+        that was scored and the number of steps.
+        """
+
+        radices = np.array(space.radices, dtype=np.int64)
+        digits = space.nearest(a=center).astype(np.int64)
+
+        # Cover every pre-infusion duration at each step
+        free = np.zeros(len(space.axes), dtype=bool)
+        if space.ncols > 5:
+            free[list(space.columns).index(0)] = True
+
+        # Descend until the best profile of a step is its starting profile
+        candidates = []
+        scored = np.empty(0, dtype=np.int64)
+        steps = 0
+        while True:
+            window = space.window(
+                lower=np.where(free, 0, np.maximum(digits - 1, 0)),
+                upper=np.where(
+                    free,
+                    radices - 1,
+                    np.minimum(digits + 1, radices - 1)
+                )
+            )
+            a = window.decode(index=np.arange(window.size))
+            index = space.encode(a=a).astype(np.int64)
+
+            # Omit the simulations of the previous steps
+            new = ~np.isin(index, scored)
+            if np.any(new):
+                candidates = self.top_candidates(
+                    sse=self.score_profiles(x=x, y=y, a=a[new]),
+                    index=index[new],
+                    candidates=candidates
+                )
+                scored = np.concatenate((scored, index[new]))
+            steps += 1
+
+            # Cast the digits, so that the window below the first value of
+            #   an axis does not wrap
+            bestDigits = space.digits(
+                index=np.array([candidates[0][1]])
+            )[0, space.columns].astype(np.int64)
+            if np.array_equal(bestDigits[~free], digits[~free]):
+                break
+            if (deadline is not None) and (time.perf_counter() > deadline):
+                break
+            digits = bestDigits
+
+        solution = self.summarize_candidates(
+            candidates=candidates,
+            simulations=scored.shape[0]
+        )
+        solution['solver'] = self.solver
+        solution['complete'] = bool(scored.shape[0] == space.size)
+        solution['coverage'] = float(
+            np.round(scored.shape[0] / space.size, 6)
+        )
+        solution['steps'] = steps
+
+        return space.decode(index=np.array([solution['id']]))[0], solution
+
+    def solve_streaming(
+        self,
+        x,
+        y,
+        space,
+        max_bytes=None,
+        workers=1
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+        max_bytes               = <int> Optional memory limit (bytes) for
+                                    scoring the simulations of each worker
+        workers                 = <int> Number of worker processes
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated espresso extraction parameters with the
+        minimal square root of the sum of squared error with the pressure
+        series, and the fitted solution. The simulations are decoded from
+        their index in chunks that fit within {max_bytes}, scored, and only
+        the running best simulation is kept. With more than one worker the
+        candidate space is split into index ranges that are scored in a
+        process pool, sharing the time and pressure series through shared
+        memory.
+        """
+
+        # Derive the chunk size from the memory used per simulation,
+        #   the parameters, the simulated profile and its temporaries
+        #   when simulating, or the parameters alone when scoring from the
+        #   Gram matrix
+        if self.solver == 'gram':
+            rowBytes = 8 * 4 * space.ncols
+        else:
+            rowBytes = 8 * (space.ncols + 6 * x.shape[0])
+        if max_bytes is None:
+            chunkSize = space.size
+        else:
+            chunkSize = int(np.max([max_bytes // rowBytes, 1]))
+
+        # Score the candidate space
+        workers = int(np.max([np.min([workers, space.size]), 1]))
+        if workers > 1:
+            bounds = np.linspace(0, space.size, workers + 1).astype(int)
+            shards = self.score_shards(
+                x=x,
+                y=y,
+                space=space,
+                bounds=bounds,
+                chunkSize=chunkSize,
+                workers=workers
+            )
+        else:
+            shards = [
+                self.score_range(
+                    x=x,
+                    y=y,
+                    space=space,
+                    start=0,
+                    stop=space.size,
+                    chunkSize=chunkSize
+                )
+            ]
+
+        # Reduce the partial solutions by error and then by id, so ties
+        #   keep the first simulation
+        candidates = heapq.nsmallest(
+            self.top_k,
+            [candidate for shard in shards for candidate in shard[0]]
+        )
+
+        solution = self.summarize_candidates(
+            candidates=candidates,
+            simulations=space.size
+        )
+        solution['solver'] = self.solver
+        solution['chunks'] = int(np.sum([shard[1] for shard in shards]))
+        solution['workers'] = workers
+        solution['chunkBytes'] = int(
+            np.min([chunkSize, -(-space.size // workers)]) *
+            8 * (space.ncols if self.solver == 'gram' else x.shape[0]) *
+            workers
+        )
+
+        return space.decode(index=np.array([solution['id']]))[0], solution
+
+    def score_range(
+        self,
+        x,
+        y,
+        space,
+        start,
+        stop,
+        chunkSize
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+        start                   = <int> First simulation id of the range
+        stop                    = <int> Simulation id after the end of the
+                                    range
+        chunkSize               = <int> Number of simulations per chunk
+
+        Description
+        ---------------------------------------------------------------------
+        Scores the simulations from {start} to {stop} in chunks of
+        {chunkSize} and returns the {top_k} simulations with the minimal
+        square root of the sum of squared error, as a list of (sse, id)
+        tuples, and the number of chunks.
+        """
+
+        candidates = []
+        chunks = 0
+        for chunkStart in range(start, stop, chunkSize):
+            a = space.decode(
+                index=np.arange(
+                    chunkStart,
+                    np.min([chunkStart + chunkSize, stop])
+                )
+            )
+            if self.solver == 'gram':
+                sse = self.score_profiles(x=x, y=y, a=a)
+            else:
+                sse = np.linalg.norm(
+                    self.render_profiles(a=a, x=x) - y,
+                    axis=1
+                )
+            candidates = self.top_candidates(
+                sse=sse,
+                index=np.arange(chunkStart, chunkStart + sse.shape[0]),
+                candidates=candidates
+            )
+            chunks += 1
+
+        return candidates, chunks
+
+    def score_shards(
+        self,
+        x,
+        y,
+        space,
+        bounds,
+        chunkSize,
+        workers
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        space                   = <CandidateSpace> Candidate space of the
+                                    possible espresso extraction parameters
+        bounds                  = <np.array()> Vector of the simulation ids
+                                    that bound each index range
+        chunkSize               = <int> Number of simulations per chunk
+        workers                 = <int> Number of worker processes
+
+        Description
+        ---------------------------------------------------------------------
+        Scores each index range within {bounds} in a process pool and
+        returns the partial solutions of {score_range} in index order.
+        """
+
+        # Share the time and pressure series with the worker processes
+        xy = np.stack((x, y)).astype(float)
+        if shared_memory is not None:
+            block = shared_memory.SharedMemory(create=True, size=xy.nbytes)
+            np.ndarray(xy.shape, dtype=xy.dtype, buffer=block.buf)[:] = xy
+            series = (block.name, xy.shape)
+        else:
+            block = None
+            series = xy
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        score_shard,
+                        self,
+                        space,
+                        int(start),
+                        int(stop),
+                        chunkSize,
+                        series
+                    )
+                    for start, stop in zip(bounds[:-1], bounds[1:])
+                ]
+                shards = [future.result() for future in futures]
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+
+        return shards
+
+    def plot_solution(
+        self,
+        solution,
+        dirName,
+        fileName
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        solution                = <dict> Dictionary object of the fitted
+                                    solution
+        dirName                 = <str> Output directory path
+        fileName                = <str> Prefix for the plot file name
+
+        Description
+        ---------------------------------------------------------------------
+        Imputes the pressure profile nodes based on the {solution} and
+        smoothed pressure time series and returns the quartiles.
+        """
+
+        # Unpack the solution
+        if 'knots' in solution['ppfa']:
+            scatterXLst = solution['ppfa']['knots']['times']
+            scatterYLst = solution['ppfa']['knots']['pressures']
+        elif solution['settings']['infusionDuration'] == 0:
+            scatterXLst = self.calculate_quartiles(
+                a=np.array([
+                    solution['settings']['p0'],
+                    solution['settings']['p1'],
+                    solution['settings']['p2'],
+                    solution['settings']['p3'],
+                    solution['settings']['p4']
+                ]),
+                xduration=solution['settings']['extractionDuration']
+            ).tolist()
+            scatterYLst = [
+                solution['settings']['p0'],
+                solution['settings']['p1'],
+                solution['settings']['p2'],
+                solution['settings']['p3'],
+                solution['settings']['p4']
+            ]
+        else:
+            scatterXLst = [
+                0,
+                solution['settings']['infusionDuration']
+            ] + self.calculate_quartiles(
+                a=np.array([
+                    solution['settings']['infusionDuration'],
+                    solution['settings']['infusionPressure'],
+                    solution['settings']['p0'],
+                    solution['settings']['p1'],
+                    solution['settings']['p2'],
+                    solution['settings']['p3'],
+                    solution['settings']['p4']
+                ]),
+                xduration=solution['settings']['extractionDuration']
+            ).tolist()
+            scatterYLst = [
+                solution['settings']['infusionPressure'],
+                solution['settings']['infusionPressure'],
+                solution['settings']['p0'],
+                solution['settings']['p1'],
+                solution['settings']['p2'],
+                solution['settings']['p3'],
+                solution['settings']['p4']
+            ]
+
+        # Create the plot figure
+        fig = plt.figure()
+        x1 = fig.add_subplot(1, 1, 1)
+        plt.figtext(
+            0.15,
+            0.95,
+            'Run-time: %s' % (
+                str(solution['ppfa']['runTime'])
+            )
+        )
+        plt.figtext(
+            0.15,
+            0.90,
+            'Sq-Root of the Sum of Squared Error: %s' % (
+                round(solution['ppfa']['sse'], 2)
+            )
+        )
+
+        # Clear, format and plot profile values
+        x1.clear()
+        x1.set_ylabel(
+            'Pressure (bars)'
+        )
+        x1.set_xlabel(
+            'Time (seconds)'
+        )
+        x1.set_xlim(
+            min(solution['settings']['timeLst']),
+            max(solution['settings']['timeLst'])
+        )
+        x1.set_ylim(
+            0,
+            12
+        )
+        x1.tick_params(
+            axis='y',
+            length=0,
+            pad=10
+        )
+        x1.tick_params(
+            axis='x',
+            length=0,
+            pad=10
+        )
+        x1.plot(
+            solution['settings']['timeLst'],
+            (
+                solution['settings']['pressureSeries']
+                [:len(solution['settings']['timeLst'])]
+            ),
+            color='blue',
+            alpha=0.25,
+            linewidth=1,
+            label='Observed'
+        )
+        x1.plot(
+            solution['settings']['timeLst'],
+            (
+                solution['settings']['pressureSeriesSmoothed']
+                [:len(solution['settings']['timeLst'])]
+            ),
+            color='blue',
+            alpha=0.5,
+            linewidth=1,
+            label='Smoothed'
+        )
+        x1.plot(
+            solution['settings']['timeLst'],
+            (
+                solution['settings']['pressureProfileLst']
+                [:len(solution['settings']['timeLst'])]
+            ),
+            color='blue',
+            alpha=1,
+            linewidth=1,
+            label='Profile'
+        )
+        x1.scatter(
+            scatterXLst,
+            scatterYLst,
+            color='red',
+            label='Solution',
+            marker='o',
+            s=25
+        )
+        x1.set_xticks(
+            ticks=np.arange(
+                min(solution['settings']['timeLst']),
+                np.ceil(max(solution['settings']['timeLst'])),
+                1
+            )
+        )
+        x1.legend(loc='upper right')
+
+        # Save
+        plt.savefig(
+            os.path.join(
+                dirName,
+                '.'.join([
+                    '_'.join([
+                        fileName,
+                        str(solution['ppfa']['simulations']),
+                        str(solution['ppfa']['id'])
+                    ]),
+                    'jpeg'
+                ])
+            )
+        )
+        plt.close('all')
+
+
+# Define basis cache class
+class BasisCache():
+
+    def __init__(
+        self,
+        maxsize=256
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        maxsize                 = <int> Maximum number of cached entries
+
+        Description
+        ---------------------------------------------------------------------
+        Creates an instance of the BasisCache class, a least-recently-used
+        cache of the knot times and sparse hat-basis of the pressure
+        profiles.
+        """
+
+        # Assign class variables
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries = collections.OrderedDict()
+
+    def get(
+        self,
+        key
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        key                     = <tuple> Cache key
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the cached value of {key}, or {None}, and counts the hit
+        or miss.
+        """
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        else:
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        key,
+        value
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        key                     = <tuple> Cache key
+        value                   = <tuple> Cache value
+
+        Description
+        ---------------------------------------------------------------------
+        Caches {value} as {key}, evicting the least-recently-used entries
+        beyond {maxsize}.
+        """
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Removes every cached entry and resets the hit and miss counters.
+        """
+
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Returns the hit and miss counters and the size of the cache.
+        """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.entries),
+            'maxsize': self.maxsize
+        }
+
+
+# Initialize the basis cache shared by every instance of EPFA
+BASIS_CACHE = BasisCache()
+
+
+# Define solution cache class
+class SolutionCache():
+
+    def __init__(
+        self,
+        path,
+        max_bytes=64 * 1024 * 1024
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        path                    = <str> Path to the SQLite database of the
+                                    cached solutions
+        max_bytes               = <int> Maximum size (bytes) of the
+                                    compressed solutions
+
+        Description
+        ---------------------------------------------------------------------
+        Creates an instance of the SolutionCache class, an on-disk store of
+        the compressed solutions of {EPFA.solve}. The least-recently-used
+        solutions are evicted beyond {max_bytes}.
+        """
+
+        # Assign class variables
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+
+    def __getstate__(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Returns the state of the cache without the database connection,
+        so that an instance of EPFA remains picklable for worker processes.
+        """
+
+        state = self.__dict__.copy()
+        state['connection'] = None
+
+        return state
+
+    def connect(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Returns the database connection, creating the database on first
+        use.
+        """
+
+        if self.connection is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            self.connection.execute(
+                ' '.join([
+                    'CREATE TABLE IF NOT EXISTS solutions (',
+                    'key TEXT PRIMARY KEY,',
+                    'value BLOB NOT NULL,',
+                    'size INTEGER NOT NULL,',
+                    'accessed REAL NOT NULL',
+                    ')'
+                ])
+            )
+            self.connection.execute(
+                ' '.join([
+                    'CREATE INDEX IF NOT EXISTS solutions_accessed',
+                    'ON solutions (accessed)'
+                ])
+            )
+            self.connection.commit()
+
+        return self.connection
+
+    def get(
+        self,
+        key
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        key                     = <str> Cache key
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the cached solution of {key}, or {None}, and counts the hit
+        or miss.
+        """
+
+        connection = self.connect()
+        row = connection.execute(
+            'SELECT value FROM solutions WHERE key = ?',
+            (key,)
+        ).fetchone()
+
+        if row is not None:
+            connection.execute(
+                'UPDATE solutions SET accessed = ? WHERE key = ?',
+                (time.time(), key)
+            )
+            connection.commit()
+            self.hits += 1
+            return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+        else:
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        key,
+        value
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        key                     = <str> Cache key
+        value                   = <dict> Solution
+
+        Description
+        ---------------------------------------------------------------------
+        Caches {value} as {key}, evicting the least-recently-used solutions
+        beyond {max_bytes}.
+        """
+
+        blob = zlib.compress(
+            json.dumps(
+                value,
+                default=lambda a: a.item()
+            ).encode('utf-8')
+        )
+
+        connection = self.connect()
+        connection.execute(
+            'INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)',
+            (key, blob, len(blob), time.time())
+        )
+
+        # Evict the least-recently-used solutions
+        size = connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM solutions'
+        ).fetchone()[0]
+        if size > self.max_bytes:
+            for evictKey, evictSize in connection.execute(
+                'SELECT key, size FROM solutions ORDER BY accessed'
+            ).fetchall():
+                if size <= self.max_bytes:
+                    break
+                connection.execute(
+                    'DELETE FROM solutions WHERE key = ?',
+                    (evictKey,)
+                )
+                size -= evictSize
+
+        connection.commit()
+
+    def clear(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Removes every cached solution and resets the hit and miss counters.
+        """
+
+        connection = self.connect()
+        connection.execute('DELETE FROM solutions')
+        connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def info(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Returns the hit and miss counters and the size of the cache.
+        """
+
+        count, size = self.connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM solutions'
+        ).fetchone()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': count,
+            'bytes': size,
+            'maxBytes': self.max_bytes
+        }
+
+
+# Define process pool functions
+def score_shard(
+    epfa,
+    space,
+    start,
+    stop,
+    chunkSize,
+    series
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    epfa                    = <EPFA> Espresso profile fitting algorithm
+    space                   = <CandidateSpace> Candidate space of the
+                                possible espresso extraction parameters
+    start                   = <int> First simulation id of the range
+    stop                    = <int> Simulation id after the end of the
+                                range
+    chunkSize               = <int> Number of simulations per chunk
+    series                  = <tuple> Name and shape of the shared memory
+                                block of the time and pressure series, or
+                                <np.array()> of the series when shared
+                                memory is unavailable
+
+    Description
+    ---------------------------------------------------------------------
+    Scores the simulations from {start} to {stop} within a worker
+    process and returns the partial solution of {EPFA.score_range}.
+    """
+
+    if isinstance(series, tuple):
+        block = shared_memory.SharedMemory(name=series[0])
+        try:
+            xy = np.ndarray(series[1], dtype=float, buffer=block.buf)
+            shard = epfa.score_range(
+                x=xy[0],
+                y=xy[1],
+                space=space,
+                start=start,
+                stop=stop,
+                chunkSize=chunkSize
+            )
+            del xy
+        finally:
+            block.close()
+    else:
+        shard = epfa.score_range(
+            x=series[0],
+            y=series[1],
+            space=space,
+            start=start,
+            stop=stop,
+            chunkSize=chunkSize
+        )
+
+    return shard
+
+
+def solve_group(
+    epfa,
+    x,
+    Y,
+    max_bytes=None,
+    resampleTimes=None
+):
+    """
+    Variables
+    ---------------------------------------------------------------------
+    epfa                    = <EPFA> Espresso profile fitting algorithm
+    x                       = <np.array()> Vector of the Time series
+                                shared by each extraction
+    Y                       = <np.array()> Matrix of the Pressure series
+                                of shape (extractions, len(x))
+    max_bytes               = <int> Optional memory limit (bytes) for
+                                scoring the simulations of each extraction
+    resampleTimes           = <list> Optional run-time (nanoseconds) of the
+                                resampling of each extraction
+
+    Description
+    ---------------------------------------------------------------------
+    Determines the best fitted pressure profile of each row of {Y}
+    within a worker process and returns the solutions in row order. The
+    library and the cache are read before the search and the cache is
+    written after it, as by {solve}, and the run-time of {reduce_many}
+    is shared evenly by the searched extractions.
+    """
+
+    if resampleTimes is None:
+        resampleTimes = [0] * Y.shape[0]
+
+    # Return the matched stored pressure profiles and the cached
+    #   solutions
+    solutions = [None] * Y.shape[0]
+    pending = []
+    for i, (y, resampleTime) in enumerate(zip(Y, resampleTimes)):
+        timings = epfa.initialize_timings()
+        timings['resample'] = resampleTime
+        t0 = time.perf_counter_ns() - resampleTime
+        solutions[i], match, key = epfa.stored_solution(
+            x=x,
+            y=y,
+            timings=timings,
+            t0=t0,
+            cacheable=True
+        )
+        if solutions[i] is None:
+            elapsed = time.perf_counter_ns() - t0
+            pending.append((i, timings, elapsed, match, key))
+
+    if not pending:
+        return solutions
+
+    # Solve the remaining extractions
+    t1 = time.perf_counter_ns()
+    reducedLst = epfa.reduce_many(
+        x=x,
+        Y=Y[[i for i, timings, elapsed, match, key in pending]]
+    )
+    share = (time.perf_counter_ns() - t1) // len(pending)
+
+    for (i, timings, elapsed, match, key), reduced in zip(
+        pending,
+        reducedLst
+    ):
+        timings['reduce'] = share
+        solutions[i] = epfa.solve_reduced(
+            x=x,
+            y=Y[i],
+            reduced=reduced,
+            max_bytes=max_bytes,
+            timings=timings,
+            t0=time.perf_counter_ns() - elapsed - share,
+            key=key,
+            match=match
+        )
+
+    return solutions
+
+
+# Define online pressure profile fitting algorithm class
+class OnlineEPFA(EPFA):
+
+    def __init__(
+        self,
+        TIME_INTERVAL=0.1,
+        START_DELAY=1,
+        EXTRACTION_DURATION_MIN=10,
+        INFUSION_DURATION_LIMIT=30,
+        INFUSION_LIMIT=4,
+        capacity=1024,
+        hook=None
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        TIME_INTERVAL           =  <float> Interval of the time series
+                                        (seconds)
+        START_DELAY             =  <int> Period of duration in time (seconds)
+                                        to omit from the expresso extraction
+                                        time-series.
+        EXTRACTION_DURATION_MIN =  <int> Minimum period of duration in time
+                                        (seconds) for an espresso extraction
+                                        to have pre-infusion.
+        INFUSION_DURATION_LIMIT =  <int> Maximum period of duration in time
+                                        (seconds) for pre-infusion.
+        INFUSION_LIMIT          =  <int> Maximum pressure (bars) for
+                                        pre-infusion.
+        capacity                =  <int> Initial number of samples held
+                                        before the buffers are grown.
+        hook                    =  <callable> Optional function called with
+                                        the timings of each solve of
+                                        {best}, as by {EPFA}.
+
+        Description
+        ---------------------------------------------------------------------
+        Initializes an instance of the online espresso profile fitting
+        algorithm. Samples are added during the extraction by {update},
+        which maintains the prefix sums of the Time and Pressure series,
+        so that the sufficient statistics of any knot interval are the
+        difference of two prefix sums. The best fitted pressure profile of
+        the samples so far is returned by {best}, by the 'dp' solver.
+        """
+
+        super().__init__(
+            TIME_INTERVAL=TIME_INTERVAL,
+            START_DELAY=START_DELAY,
+            EXTRACTION_DURATION_MIN=EXTRACTION_DURATION_MIN,
+            INFUSION_DURATION_LIMIT=INFUSION_DURATION_LIMIT,
+            INFUSION_LIMIT=INFUSION_LIMIT,
+            solver='dp',
+            resample=False,
+            hook=hook
+        )
+
+        # Initialize the buffers
+        #   sums holds the prefix sums of x, x^2, y, xy and y^2, with
+        #   the empty prefix in the first row.
+        self.count = 0
+        self.times = np.empty(capacity)
+        self.pressures = np.empty(capacity)
+        self.sums = np.zeros((capacity + 1, 5))
+        self.solution = None
+        self.solutionCount = 0
+
+    def update(
+        self,
+        t,
+        p
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        t                       = <float> Time (seconds) of the sample
+        p                       = <float> Pressure (bars) of the sample
+
+        Description
+        ---------------------------------------------------------------------
+        Appends a sample of the espresso extraction and updates the prefix
+        sums in amortized constant time. Samples are expected in time
+        order at {TIME_INTERVAL}.
+        """
+
+        # Grow the buffers
+        if self.count == self.times.shape[0]:
+            self.times = np.concatenate((self.times, np.empty(self.count)))
+            self.pressures = np.concatenate(
+                (self.pressures, np.empty(self.count))
+            )
+            self.sums = np.concatenate(
+                (self.sums, np.zeros((self.count, 5)))
+            )
+
+        # Append the sample and its prefix sums
+        self.times[self.count] = t
+        self.pressures[self.count] = p
+        self.sums[self.count + 1] = self.sums[self.count] + (
+            t, t * t, p, t * p, p * p
+        )
+        self.count += 1
+
+    def reset(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Removes every sample for the next extraction.
+        """
+
+        self.count = 0
+        self.solution = None
+        self.solutionCount = 0
+
+    def best(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Returns the best fitted pressure profile of the samples so far, as
+        returned by {EPFA.solve}, or {None} before five samples. The
+        solution is kept until the next sample, so repeated calls between
+        samples are free.
+        """
+
+        if self.count < 5:
+            return None
+
+        if self.solutionCount != self.count:
+            t0 = time.perf_counter_ns()
+            timings = self.initialize_timings()
+            x = self.times[:self.count]
+            y = self.pressures[:self.count]
+            reduced = self.reduce(x=x, y=y)
+            timings['reduce'] = time.perf_counter_ns() - t0
+            self.solution = self.solve_reduced(
+                x=x,
+                y=y,
+                reduced=reduced,
+                timings=timings,
+                t0=t0
+            )
+            self.solutionCount = self.count
+
+        return self.solution
+
+    def knot_statistics(
+        self,
+        x,
+        y,
+        infusionDuration
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+        infusionDuration        = <float> Pre-infusion duration (seconds),
+                                    {0} without pre-infusion
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the sufficient statistics of {segment_statistics} of each
+        knot interval from the prefix sums of the samples, as described by
+        {interval_statistics}. Samples before the first knot and after the
+        last knot take the value of the first and the last knot. Series
+        other than the buffered samples, e.g. of {solve}, {solve_many} or of
+        a decimated series, are summed by {EPFA.knot_statistics}.
+        """
+
+        # Sum series other than the buffered samples directly
+        if (
+            (x.shape[0] != self.count) or
+            (not np.shares_memory(x, self.times)) or
+            (not np.shares_memory(y, self.pressures))
+        ):
+            return super().knot_statistics(
+                x=x,
+                y=y,
+                infusionDuration=infusionDuration
+            )
+
+        # Derive the knot times
+        if infusionDuration > 0:
+            a = np.array([infusionDuration, 0, 0, 0, 0, 0, 0])
+        else:
+            a = np.zeros(5)
+        xp = self.knot_times(a=a, xduration=x[-1])
+
+        # Sum each knot interval
+        bounds = np.searchsorted(x, xp)
+        s = self.interval_statistics(
+            sums=self.sums,
+            lo=bounds[:-1],
+            hi=bounds[1:],
+            xa=xp[:-1],
+            xb=xp[1:]
+        )
+
+        # Hold the first and the last knot values beyond the knots
+        before = self.sums[bounds[0]] - self.sums[0]
+        after = self.sums[x.shape[0]] - self.sums[bounds[-1]]
+        s[0] += (bounds[0], 0, 0, before[2], 0, before[4])
+        s[-1] += (
+            0, 0, x.shape[0] - bounds[-1], 0, after[2], after[4]
+        )
+
+        return s
+
+
+# Define candidate space class
+class CandidateSpace():
+
+    def __init__(
+        self,
+        xti,
+        ypi,
+        yp0,
+        yp1,
+        yp2,
+        yp3,
+        yp4
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        xti                     = <np.array()> Vector of possible pre-infusion
+                                    duration values (seconds)
+        ypi                     = <np.array()> Vector of possible pre-infusion
+                                    pressure values (bars)
+        yp0                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 1st quartile
+        yp1                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 2nd quartile
+        yp2                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 3rd quartile
+        yp3                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 4th quartile
+        yp4                     = <np.array()> Vector of possible extraction
+                                    pressure values (bars) for the 5th quartile
+
+        Description
+        ---------------------------------------------------------------------
+        Creates an instance of the CandidateSpace class, the Cartesian
+        product of the possible espresso extraction parameters indexed in
+        the same order as {EPFA.simulate_parameters}.
+        """
+
+        # Assign the axes of the candidate space, fastest varying first,
+        #   and the parameter column of each axis. The meshgrid swaps its
+        #   first two axes, so the pre-infusion pressure varies fastest,
+        #   followed by the pre-infusion duration and {p0} to {p4}.
+        #   Without pre-infusion {p1} varies fastest, followed by {p0},
+        #   {p2}, {p3} and {p4}.
+        if ypi.shape[0] > 0:
+            self.axes = [ypi, xti, yp0, yp1, yp2, yp3, yp4]
+            self.columns = [1, 0, 2, 3, 4, 5, 6]
+        else:
+            self.axes = [yp1, yp0, yp2, yp3, yp4]
+            self.columns = [1, 0, 2, 3, 4]
+        self.ncols = len(self.axes)
+        self.radices = [axis.shape[0] for axis in self.axes]
+        self.size = int(np.prod(self.radices))
+
+        # Assign the storage type of the digits of a simulation id
+        if np.max(self.radices) <= np.iinfo(np.uint8).max + 1:
+            self.dtype = np.uint8
+        else:
+            self.dtype = np.uint16
+
+    def knot_axes(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Returns the list of the vectors of possible knot pressure values
+        in knot order, {ypi}, {yp0}, {yp1}, {yp2}, {yp3}, {yp4} with
+        pre-infusion, otherwise {yp0}, {yp1}, {yp2}, {yp3}, {yp4}, and
+        the vector of possible pre-infusion duration values, {0} without
+        pre-infusion.
+        """
+
+        axes = [None] * self.ncols
+        for axis, column in zip(self.axes, self.columns):
+            axes[column] = axis
+
+        if self.ncols > 5:
+            return axes[1:], axes[0]
+        else:
+            return axes, np.array([0])
+
+    def nearest(
+        self,
+        a
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        a                       = <np.array()> Espresso extraction parameters
+                                    of shape ({ncols}, )
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the position of the possible value nearest each parameter
+        of {a} within each axis.
+        """
+
+        return np.array([
+            np.argmin(np.abs(axis - a[column]))
+            for axis, column in zip(self.axes, self.columns)
+        ])
+
+    def window(
+        self,
+        lower,
+        upper
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        lower                   = <np.array()> Vector of the first position
+                                    within each axis
+        upper                   = <np.array()> Vector of the last position
+                                    within each axis
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the candidate space of the possible values from {lower}
+        to {upper} of each axis.
+        """
+
+        window = copy.copy(self)
+        window.axes = [
+            axis[first:last + 1]
+            for axis, first, last in zip(self.axes, lower, upper)
+        ]
+        window.radices = [axis.shape[0] for axis in window.axes]
+        window.size = int(np.prod(window.radices))
+
+        return window
+
+    def digits(
+        self,
+        index
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        index                   = <np.array()> Vector of simulation ids
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the position of each parameter of each id in {index}
+        within its vector of possible values, as an array of shape
+        (len(index), {ncols}) of {dtype}.
+        """
+
+        digits = np.empty((index.shape[0], self.ncols), dtype=self.dtype)
+        remainder = np.asarray(index, dtype=np.int64)
+        for column, radix in zip(self.columns, self.radices):
+            remainder, digits[:, column] = np.divmod(remainder, radix)
+
+        return digits
+
+    def encode(
+        self,
+        a
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        a                       = <np.array()> Simulated espresso extraction
+                                    parameters of shape (n, {ncols})
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulation id of each row of {a}.
+        """
+
+        index = np.zeros(a.shape[0], dtype=np.int64)
+        for axis, column, radix in zip(
+            reversed(self.axes),
+            reversed(self.columns),
+            reversed(self.radices)
+        ):
+            index = index * radix + np.searchsorted(axis, a[:, column])
+
+        return index
+
+    def decode(
+        self,
+        index
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        index                   = <np.array()> Vector of simulation ids
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the simulated espresso extraction parameters of each id
+        in {index} as an array of shape (len(index), {ncols}).
+        """
+
+        digits = self.digits(index=index)
+        a = np.empty((index.shape[0], self.ncols))
+        for axis, column in zip(self.axes, self.columns):
+            a[:, column] = axis[digits[:, column]]
+
+        return a
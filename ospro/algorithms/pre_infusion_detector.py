@@ -0,0 +1,275 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : pre_infusion_detector.py
+Location    : ~/ospro/algorithms
+
+Description
+---------------------------------------------------------------------
+Detects the end of pre-infusion in an espresso extraction, one
+pressure sample at a time, by a cumulative sum (CUSUM) of the smoothed
+pressure above the pre-infusion pressure limit.
+"""
+
+# Import modules
+import collections
+import numpy as np
+
+
+# Define pre-infusion detector class
+class PreInfusionDetector():
+
+    def __init__(
+        self,
+        TIME_INTERVAL=0.1,
+        START_DELAY=1,
+        INFUSION_LIMIT=4,
+        threshold=0,
+        size=7
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        TIME_INTERVAL           =  <float> Interval of the time series
+                                        (seconds)
+        START_DELAY             =  <int> Period of duration in time (seconds)
+                                        to omit from the expresso extraction
+                                        time-series.
+        INFUSION_LIMIT          =  <int> Maximum pressure (bars) for
+                                        pre-infusion.
+        threshold               =  <float> Cumulative sum (bar-samples) of
+                                        the smoothed pressure above
+                                        {INFUSION_LIMIT} that signals the
+                                        end of pre-infusion. With {0} the
+                                        first smoothed pressure at or above
+                                        {INFUSION_LIMIT} signals the end of
+                                        pre-infusion, larger values ignore
+                                        brief pressure spikes.
+        size                    =  <int> Number of samples of the centered
+                                        moving average, as {EPFA.smooth}.
+
+        Description
+        ---------------------------------------------------------------------
+        Creates an instance of the PreInfusionDetector class. Samples are
+        added during the extraction by {update}, which holds only the
+        samples of the moving average, so that each sample is processed in
+        constant time and memory. The smoothed pressure lags the samples
+        by half of {size}, and {finish} smooths the last samples at the
+        end of the extraction. The smoothed pressure is identical to
+        {EPFA.smooth}, so that the detected index is identical to a scan of
+        the whole extraction by {scan}.
+        """
+
+        # Assign class variables
+        self.TIME_INTERVAL = TIME_INTERVAL
+        self.START_DELAY = START_DELAY
+        self.INFUSION_LIMIT = INFUSION_LIMIT
+        self.threshold = threshold
+        self.size = size
+        self.start = int(
+            np.round(
+                START_DELAY * np.round(1 / TIME_INTERVAL, decimals=0),
+                decimals=0
+            )
+        )
+
+        # Initialize the state
+        self.reset()
+
+    def reset(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Removes every sample for the next extraction.
+        """
+
+        self.count = 0
+        self.head = []
+        self.window = collections.deque(maxlen=self.size)
+        self.total = 0.0
+        self.smoothed = 0
+        self.cusum = 0.0
+        self.onset = None
+        self.index = None
+        self.finished = False
+
+    def update(
+        self,
+        p
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        p                       = <float> Pressure (bars) of the sample
+
+        Description
+        ---------------------------------------------------------------------
+        Appends a sample of the espresso extraction and returns the index
+        of the end of pre-infusion, or {None} until it is detected.
+        Samples are expected in time order at {TIME_INTERVAL}.
+        """
+
+        self.count += 1
+        half = self.size // 2
+
+        # Hold the first samples until the start of the series can be
+        #   reflected, as the 'reflect' mode of {EPFA.smooth}
+        if self.count <= half:
+            self.head.append(float(p))
+            if self.count == half:
+                for value in self.head[::-1] + self.head:
+                    self.push(value=value)
+        else:
+            self.push(value=float(p))
+
+        return self.index
+
+    def finish(
+        self
+    ):
+        """
+        Description
+        ---------------------------------------------------------------------
+        Smooths the last samples of the extraction by reflecting the end
+        of the series, and returns the index of the end of pre-infusion, or
+        {None} when it was not detected.
+        """
+
+        half = self.size // 2
+        if (not self.finished) and (self.count >= half):
+            for value in list(self.window)[-half:][::-1]:
+                self.push(value=value)
+        self.finished = True
+
+        return self.index
+
+    def push(
+        self,
+        value
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        value                   = <float> Pressure (bars) of the reflected
+                                    series
+
+        Description
+        ---------------------------------------------------------------------
+        Appends a value to the moving average. The running sum is updated
+        by the difference of the entering and the leaving values, and
+        divided on output, as {scipy.ndimage.uniform_filter1d}.
+        """
+
+        if len(self.window) < self.size:
+            self.total += value
+        else:
+            self.total += (value - self.window[0])
+        self.window.append(value)
+
+        if len(self.window) == self.size:
+            self.step(ysmoothed=self.total / self.size)
+
+    def step(
+        self,
+        ysmoothed
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        ysmoothed               = <float> Smoothed pressure (bars) of the
+                                    next index
+
+        Description
+        ---------------------------------------------------------------------
+        Updates the cumulative sum of the smoothed pressure above
+        {INFUSION_LIMIT}. The end of pre-infusion is the first index of the
+        excursion of the cumulative sum above zero that reaches
+        {threshold}.
+        """
+
+        i = self.smoothed
+        self.smoothed += 1
+        if (self.index is not None) or (i < self.start):
+            return
+
+        # Start a new excursion
+        if self.cusum == 0:
+            self.onset = i
+
+        cusum = self.cusum + (ysmoothed - self.INFUSION_LIMIT)
+        if cusum >= self.threshold:
+            self.index = self.onset
+        else:
+            self.cusum = max(cusum, 0.0)
+
+    def scan(
+        self,
+        ysmoothed,
+        lengths=None
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        ysmoothed               = <np.array()> Vector of the smoothed
+                                    Pressure series, or matrix of the
+                                    smoothed Pressure series of shape
+                                    (extractions, samples)
+        lengths                 = <np.array()> Optional vector of the number
+                                    of valid samples in each row of
+                                    {ysmoothed}
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the index of the end of pre-infusion along the last axis of
+        {ysmoothed}, or {-1} where it is not detected, as {update} would
+        for each series. Samples beyond {lengths} are ignored.
+        """
+
+        ysmoothed = np.asarray(ysmoothed, dtype=float)
+        n = ysmoothed.shape[-1]
+
+        # Mask the valid samples after {START_DELAY}
+        valid = np.broadcast_to(
+            np.arange(n) >= self.start,
+            ysmoothed.shape
+        )
+        if lengths is not None:
+            valid = valid & (
+                np.arange(n) < np.asarray(lengths)[:, np.newaxis]
+            )
+
+        # The cumulative sum never exceeds zero before it reaches a
+        #   threshold of zero, so the end of pre-infusion is the first
+        #   smoothed pressure at or above {INFUSION_LIMIT}
+        if self.threshold <= 0:
+            exceeds = valid & (
+                (ysmoothed - self.INFUSION_LIMIT) >= self.threshold
+            )
+            return np.where(
+                np.any(exceeds, axis=-1),
+                np.argmax(exceeds, axis=-1),
+                -1
+            )
+
+        # Otherwise step the cumulative sum of every series together
+        shape = ysmoothed.shape[:-1]
+        cusum = np.zeros(shape)
+        onset = np.zeros(shape, dtype=int)
+        index = np.full(shape, -1)
+        for i in range(self.start, n):
+            if np.all(index >= 0):
+                break
+            active = valid[..., i] & (index < 0)
+            onset = np.where(active & (cusum == 0), i, onset)
+            step = cusum + (ysmoothed[..., i] - self.INFUSION_LIMIT)
+            detected = active & (step >= self.threshold)
+            index = np.where(detected, onset, index)
+            cusum = np.where(
+                active & ~detected,
+                np.maximum(step, 0.0),
+                cusum
+            )
+
+        return index
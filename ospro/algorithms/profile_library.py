@@ -0,0 +1,166 @@
+"""
+Information
+---------------------------------------------------------------------
+Name        : profile_library.py
+Location    : ~/ospro/algorithms
+
+Description
+---------------------------------------------------------------------
+Indexes the stored pressure profiles and matches espresso extraction
+time-series to the closest stored profile.
+"""
+
+# Import modules
+import os
+import numpy as np
+import ospro.utils.utils as utils
+
+
+# Define pressure profile library class
+class ProfileLibrary():
+
+    def __init__(
+        self,
+        dirName,
+        length=256,
+        tolerance=0.5,
+        duration_tolerance=1
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        dirName                 = <str> Path to ~/config/profiles/ that
+                                    contains the pressure profile configs
+        length                  = <int> Number of values each pressure
+                                    profile is resampled to
+        tolerance               = <float> Maximum root-mean-square distance
+                                    (bars) of a match
+        duration_tolerance      = <float> Maximum difference (seconds)
+                                    between the duration of an extraction
+                                    and of a matched pressure profile
+
+        Description
+        ---------------------------------------------------------------------
+        Creates an instance of the ProfileLibrary class. The
+        {pressureProfileLst} of each stored pressure profile is resampled
+        to {length} values over its duration and held as a row of a
+        matrix, so that an extraction is compared with every stored
+        profile by a single matrix-vector product.
+        """
+
+        # Assign class variables
+        self.length = length
+        self.tolerance = tolerance
+        self.duration_tolerance = duration_tolerance
+        self.profiles = []
+        self.durations = np.empty(0)
+        self.matrix = np.empty((0, length))
+        self.norms = np.empty(0)
+
+        # Index the stored pressure profiles
+        if os.path.isdir(dirName):
+            for file in sorted(os.listdir(dirName)):
+                if (
+                    (file.split('.')[0].upper().strip() != 'DTYPES') and
+                    (file.split('.')[-1].upper() == 'JSON')
+                ):
+                    self.add(
+                        profile=utils.read_config(
+                            configLoc=os.path.join(dirName, file)
+                        )
+                    )
+
+    def add(
+        self,
+        profile
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        profile                 = <dict> Dictionary object of a pressure
+                                    profile config
+
+        Description
+        ---------------------------------------------------------------------
+        Adds a pressure profile config to the index. Profiles without a
+        pressure profile, such as the 'Manual' profile, are skipped.
+        """
+
+        timeLst = profile['settings']['timeLst']
+        pressureProfileLst = profile['settings']['pressureProfileLst']
+        if (len(timeLst) < 2) or (len(timeLst) != len(pressureProfileLst)):
+            return
+
+        row = self.resample(
+            x=np.array(timeLst, dtype=float),
+            y=np.array(pressureProfileLst, dtype=float)
+        )
+        self.profiles.append(profile)
+        self.durations = np.append(
+            self.durations,
+            float(timeLst[-1] - timeLst[0])
+        )
+        self.matrix = np.vstack((self.matrix, row))
+        self.norms = np.append(self.norms, row @ row)
+
+    def resample(
+        self,
+        x,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns {y} linearly interpolated onto {length} evenly spaced time
+        values from the first to the last value of {x}.
+        """
+
+        return np.interp(
+            np.linspace(x[0], x[-1], self.length),
+            x,
+            y
+        )
+
+    def match(
+        self,
+        x,
+        y
+    ):
+        """
+        Variables
+        ---------------------------------------------------------------------
+        x                       = <np.array()> Vector of the Time series
+        y                       = <np.array()> Vector of the Pressure series
+
+        Description
+        ---------------------------------------------------------------------
+        Returns the closest stored pressure profile config of a similar
+        duration and its root-mean-square distance (bars) from the
+        extraction, or {None} and {np.inf} when no stored profile is of a
+        similar duration. The closest profile is a match when the distance
+        is within {tolerance}.
+        """
+
+        v = self.resample(x=x, y=y)
+
+        # Evaluate the distance to every stored profile
+        #   ||m - v||^2 = ||m||^2 - 2m'v + ||v||^2
+        distances = np.sqrt(
+            np.maximum(self.norms - 2 * (self.matrix @ v) + v @ v, 0) /
+            self.length
+        )
+        distances[
+            np.abs(self.durations - (x[-1] - x[0])) > self.duration_tolerance
+        ] = np.inf
+
+        if (distances.shape[0] == 0) or np.isinf(np.min(distances)):
+            return None, np.inf
+
+        index = int(np.argmin(distances))
+
+        return self.profiles[index], float(distances[index])
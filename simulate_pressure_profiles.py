@@ -19,6 +19,9 @@ import datetime as dt
 import pandas as pd
 import ospro.utils.utils as utils
 from ospro.algorithms.espresso_profile_fitting_algorithm import EPFA as EPFA
+from ospro.algorithms.espresso_profile_fitting_algorithm import (
+    SolutionCache as SolutionCache
+)
 
 # Run simulations
 if __name__ == '__main__':
@@ -44,6 +47,14 @@ if __name__ == '__main__':
         config=config
     )
 
+    # Initialize the solution cache shared across simulation runs
+    cache = SolutionCache(
+        path=os.path.join(
+            config['outputs']['path'],
+            'cache.sqlite'
+        )
+    )
+
     # Generate the results output
     with open(
         os.path.join(
@@ -85,7 +96,7 @@ if __name__ == '__main__':
             y = df['Pressure'].to_numpy()
 
             # Initialize the espresso profile fitting algorithm
-            epfa = EPFA()
+            epfa = EPFA(cache=cache)
 
             # Call the espresso profile fitting algorithm
             t1 = time.time()